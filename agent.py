@@ -1,10 +1,26 @@
-import streamlit as st
-from datetime import datetime, timedelta
-from api_handlers import (
-    get_flights, get_hotels, get_weather,
-    get_attractions_from_amadeus, get_attractions_from_gemini,
-    generate_generic_attractions
+from datetime import datetime
+from api_handlers import (  # also registers data providers
+    get_reasoning_from_gemini, flights_cache_key, hotels_cache_key, forecast_cache_key, city_ref
 )
+from plan_schema import compact_flight, compact_hotel, compact_weather
+from plan_store import plan_id_for
+from climatology import daily_weather
+from ledger import CostLedger, get_fx_rates, offer_amount, convert, format_money
+from providers import race
+from attraction_store import query_attractions, save_attractions
+from group import party, travelers, cost_units, describe_party
+from prompts import TokenBudget
+
+BUDGET_CATEGORIES = ['flights', 'hotels', 'activities', 'food', 'transport']
+
+# Categories that scale with the number of travellers; the rest (hotels) are shared by the group
+PER_PERSON_CATEGORIES = ('flights', 'activities', 'food', 'transport')
+
+STYLE_MULTIPLIERS = {
+    'budget': {'flights': 0.30, 'hotels': 0.20, 'activities': 0.18, 'food': 0.25, 'transport': 0.07},
+    'mid-range': {'flights': 0.35, 'hotels': 0.25, 'activities': 0.15, 'food': 0.20, 'transport': 0.05},
+    'luxury': {'flights': 0.25, 'hotels': 0.35, 'activities': 0.15, 'food': 0.20, 'transport': 0.05}
+}
 
 class TravelAgent:
     '''Autonomous AI Agent implementing PERCEIVE -> REASON -> PLAN -> ACT'''
@@ -16,11 +32,13 @@ class TravelAgent:
         self.reasoning_output = {}
         self.itinerary_plan = {}
         self.final_output = {}
+        self._daily_weather_cache = None
+        self.fx_rates = None
+        self.party = party(user_input)
+        self.llm_budget = TokenBudget()
     
     def perceive(self):
         '''PILLAR 1: Gather and analyze all necessary information'''
-        st.info("🔍 PERCEIVING: Gathering information from multiple sources...")
-        
         self.perceived_data = {
             'destination': self.user_input['destination'],
             'origin': self.user_input['origin'],
@@ -33,77 +51,64 @@ class TravelAgent:
             'budget': self.user_input['budget'],
             'interests': self.user_input['interests'],
             'travel_style': self.user_input['travel_style'],
-            'pace': self.user_input['pace']
+            'pace': self.user_input['pace'],
+            'party': self.party
         }
         
-        with st.spinner("Fetching flights..."):
-            self.perceived_data['flights'] = get_flights(
-                self.apis,
-                self.user_input['origin'],
-                self.user_input['destination'],
-                self.user_input['start_date'],
-                self.user_input['end_date']
-            )
-        
-        with st.spinner("Fetching hotels..."):
-            self.perceived_data['hotels'] = get_hotels(
-                self.apis,
-                self.user_input['destination'],
-                self.user_input['start_date'],
-                self.user_input['end_date'],
-                self.perceived_data['dates']['duration']
-            )
+        query = {
+            'origin': self.user_input['origin'],
+            'destination': self.user_input['destination'],
+            'origin_id': self.user_input.get('origin_id'),
+            'destination_id': self.user_input.get('destination_id'),
+            'start_date': self.user_input['start_date'],
+            'end_date': self.user_input['end_date'],
+            'duration': self.perceived_data['dates']['duration'],
+            'interests': self.user_input['interests'],
+            'llm_budget': self.llm_budget,
+            **self.party
+        }
         
-        with st.spinner("Fetching weather..."):
-            self.perceived_data['weather'] = get_weather(
-                self.apis,
-                self.user_input['destination'],
-                self.user_input['start_date'],
-                self.perceived_data['dates']['duration']
-            )
+        self.perceived_data['flights'], _ = race('flights', self.apis, query)
+        self.perceived_data['hotels'], _ = race('hotels', self.apis, query)
+        self.perceived_data['weather'], _ = race('weather', self.apis, query)
         
-        with st.spinner("Fetching attractions..."):
-            attractions = get_attractions_from_amadeus(self.apis, self.user_input['destination'])
-            if not attractions:
-                attractions = get_attractions_from_gemini(
-                    self.apis,
-                    self.user_input['destination'],
-                    self.user_input['interests']
-                )
-            if not attractions:
-                attractions = generate_generic_attractions(
-                    self.user_input['destination'],
-                    self.user_input['interests']
-                )
-            self.perceived_data['attractions'] = attractions
+        # Stored per canonical city ID, so Paris, France and Paris, Texas never share attractions
+        city = city_ref(self.user_input['destination'], self.user_input.get('destination_id'))
+        attractions = query_attractions(city, self.user_input['interests'])
+        if not attractions:
+            attractions, source = race('attractions', self.apis, query)
+            if attractions and source != 'fallback':
+                tags = self.user_input['interests'] if source == 'gemini' else ()
+                save_attractions(city, attractions, tags, source)
+        self.perceived_data['attractions'] = attractions
         
-        st.success("✅ Perception Complete!")
         return self.perceived_data
     
     def reason(self):
         '''PILLAR 2: Analyze data and make intelligent decisions'''
-        st.info("🧠 REASONING: Analyzing options...")
-        
         budget = self.perceived_data['budget']
         
-        style_multipliers = {
-            'budget': {'flights': 0.30, 'hotels': 0.20, 'activities': 0.18, 'food': 0.25, 'transport': 0.07},
-            'mid-range': {'flights': 0.35, 'hotels': 0.25, 'activities': 0.15, 'food': 0.20, 'transport': 0.05},
-            'luxury': {'flights': 0.25, 'hotels': 0.35, 'activities': 0.15, 'food': 0.20, 'transport': 0.05}
+        multipliers = STYLE_MULTIPLIERS[self.user_input['travel_style']]
+        budget_strategy = {k: int(budget * v) for k, v in multipliers.items()}
+        
+        # The budget covers the whole group: per-person categories split across travellers
+        group_size = travelers(self.party)
+        budget_split = {
+            'per_person': {k: round(v / group_size, 2) for k, v in budget_strategy.items() if k in PER_PERSON_CATEGORIES},
+            'shared': {k: v for k, v in budget_strategy.items() if k not in PER_PERSON_CATEGORIES}
         }
         
-        multipliers = style_multipliers[self.user_input['travel_style']]
-        budget_strategy = {k: int(budget * v) for k, v in multipliers.items()}
+        self.fx_rates = get_fx_rates()
         
         flights = self.perceived_data['flights']
-        selected_flight = min(flights, key=lambda f: float(f['price']['total'])) if flights else None
+        selected_flight = min(flights, key=lambda f: offer_amount(f['price'], self.fx_rates)) if flights else None
         
         hotels = self.perceived_data['hotels']
         hotel_budget = budget_strategy['hotels']
         selected_hotel = None
         
         for hotel in hotels:
-            hotel_price = float(hotel['offers'][0]['price']['total'])
+            hotel_price = offer_amount(hotel['offers'][0]['price'], self.fx_rates)
             if hotel_price <= hotel_budget * 1.1:
                 selected_hotel = hotel
                 break
@@ -111,60 +116,49 @@ class TravelAgent:
         if not selected_hotel and hotels:
             selected_hotel = hotels[0]
         
-        reasoning_text = "Budget optimized based on travel style."
-        
-        if self.apis['gemini']:
-            try:
-                prompt = f'''Analyze travel plan for {self.perceived_data['destination']}, 
-Budget ${budget}, {self.perceived_data['dates']['duration']} days, 
-Interests: {', '.join(self.perceived_data['interests'])}.
-Provide brief recommendations in 150 words.'''
-                response = self.apis['gemini'].generate_content(prompt)
-                reasoning_text = response.text
-            except:
-                pass
+        reasoning_text = get_reasoning_from_gemini(
+            self.apis,
+            self.perceived_data['destination'],
+            budget,
+            self.perceived_data['dates']['duration'],
+            self.perceived_data['interests'],
+            llm_budget=self.llm_budget
+        ) or "Budget optimized based on travel style."
         
         self.reasoning_output = {
             'budget_strategy': budget_strategy,
+            'budget_split': budget_split,
             'reasoning_summary': reasoning_text,
             'selected_flight': selected_flight,
             'selected_hotel': selected_hotel,
             'top_attractions': self.perceived_data['attractions'][:5]
         }
         
-        st.success("✅ Reasoning Complete!")
         return self.reasoning_output
     
     def plan(self):
         '''PILLAR 3: Create detailed day-by-day itinerary'''
-        st.info("📋 PLANNING: Creating itinerary...")
+        self.itinerary_plan = self._build_itinerary(self.reasoning_output['budget_strategy'])
         
+        return self.itinerary_plan
+    
+    def _build_itinerary(self, budget_strategy):
+        '''Build the day-by-day itinerary for a given budget strategy'''
         duration = self.perceived_data['dates']['duration']
-        attractions = self.perceived_data['attractions']
-        weather = self.perceived_data['weather']['list']
         
-        daily_activity_budget = self.reasoning_output['budget_strategy']['activities'] // duration
-        daily_food_budget = self.reasoning_output['budget_strategy']['food'] // duration
+        daily_food_budget = budget_strategy['food'] // duration
         
-        self.itinerary_plan = {}
+        itinerary = {}
         
-        for day_num in range(duration):
+        for day_num, (day_date, day_weather) in enumerate(self._daily_weather()):
             day_key = f'day_{day_num + 1}'
-            day_date = (datetime.strptime(self.perceived_data['dates']['start'], '%Y-%m-%d') + 
-                       timedelta(days=day_num)).strftime('%Y-%m-%d')
-            
-            day_weather = weather[min(day_num, len(weather)-1)]
-            weather_condition = day_weather['weather'][0]['main']
-            temp = day_weather['main']['temp']
-            
-            morning_attraction = attractions[day_num % len(attractions)] if attractions else None
-            afternoon_attraction = attractions[(day_num + 1) % len(attractions)] if len(attractions) > 1 else None
+            weather_condition = day_weather['condition']
+            temp = day_weather['temp']
             
-            morning_cost = morning_attraction['price'] if morning_attraction else 15
-            afternoon_cost = afternoon_attraction['price'] if afternoon_attraction else 20
-            evening_cost = daily_food_budget - 15
+            morning_attraction, afternoon_attraction = self._day_attractions(day_num)
+            morning_cost, afternoon_cost, evening_cost = self._slot_costs(day_num, daily_food_budget)
             
-            self.itinerary_plan[day_key] = {
+            itinerary[day_key] = {
                 'date': day_date,
                 'day_number': day_num + 1,
                 'morning': {
@@ -191,15 +185,52 @@ Provide brief recommendations in 150 words.'''
                 'weather': {
                     'condition': weather_condition,
                     'temperature': f"{temp:.1f}°C",
-                    'recommendation': self._get_weather_rec(weather_condition)
+                    'recommendation': self._get_weather_rec(weather_condition),
+                    'source': day_weather['source']
                 },
                 'total_cost': morning_cost + afternoon_cost + evening_cost,
                 'tips': f"Wear comfortable shoes. {self._weather_tip(weather_condition)}",
                 'energy_level': ['High', 'Moderate', 'Relaxed'][day_num % 3]
             }
         
-        st.success("✅ Planning Complete!")
-        return self.itinerary_plan
+        return itinerary
+    
+    def _day_attractions(self, day_num):
+        attractions = self.perceived_data['attractions']
+        morning = attractions[day_num % len(attractions)] if attractions else None
+        afternoon = attractions[(day_num + 1) % len(attractions)] if len(attractions) > 1 else None
+        return morning, afternoon
+    
+    def _slot_costs(self, day_num, daily_food_budget):
+        '''(morning, afternoon, evening) cost of one day for the whole group'''
+        morning, afternoon = self._day_attractions(day_num)
+        units = cost_units(self.party)
+        
+        # Per-person prices times the party's cost units. Attraction prices and
+        # allowances are USD; budgets are already in the base currency.
+        morning_cost = round(convert(morning['price'] if morning else 15, 'USD', self.fx_rates) * units, 2)
+        afternoon_cost = round(convert(afternoon['price'] if afternoon else 20, 'USD', self.fx_rates) * units, 2)
+        # The food budget covers the whole group: take the 15/person lunch allowance off each share
+        evening_cost = round(max(0, daily_food_budget / units - convert(15, 'USD', self.fx_rates)) * units, 2)
+        return morning_cost, afternoon_cost, evening_cost
+    
+    def _activities_cost(self, budget_strategy):
+        '''Planned activities and food total for a budget strategy, without building the itinerary'''
+        duration = self.perceived_data['dates']['duration']
+        daily_food_budget = budget_strategy['food'] // duration
+        return sum(sum(self._slot_costs(day_num, daily_food_budget)) for day_num in range(duration))
+    
+    def _daily_weather(self):
+        '''Per-day (date, weather) pairs, computed once per agent'''
+        if self._daily_weather_cache is None:
+            self._daily_weather_cache = daily_weather(
+                self.perceived_data['weather'],
+                self.perceived_data['destination'],
+                self.perceived_data['dates']['start'],
+                self.perceived_data['dates']['duration'],
+                self.user_input.get('destination_id')
+            )
+        return self._daily_weather_cache
     
     def _get_weather_rec(self, condition):
         recs = {
@@ -222,13 +253,16 @@ Provide brief recommendations in 150 words.'''
     
     def act(self):
         '''PILLAR 4: Execute and compile final plan'''
-        st.info("🚀 ACTING: Compiling results...")
-        
-        flight_cost = float(self.reasoning_output['selected_flight']['price']['total']) if self.reasoning_output['selected_flight'] else 0
-        hotel_cost = float(self.reasoning_output['selected_hotel']['offers'][0]['price']['total']) if self.reasoning_output['selected_hotel'] else 0
-        activities_cost = sum([day['total_cost'] for day in self.itinerary_plan.values()])
+        ledger = self._build_ledger()
+        costs = ledger.totals()['by_category']
+        origin = city_ref(self.perceived_data['origin'], self.user_input.get('origin_id'))
+        destination = city_ref(self.perceived_data['destination'], self.user_input.get('destination_id'))
+        flight_cost = costs.get('flights', 0)
+        hotel_cost = costs.get('hotels', 0)
+        activities_cost = costs.get('activities', 0) + costs.get('food', 0)
         
         self.final_output = {
+            'plan_id': plan_id_for(self.user_input),
             'summary': {
                 'destination': self.perceived_data['destination'],
                 'origin': self.perceived_data['origin'],
@@ -236,41 +270,73 @@ Provide brief recommendations in 150 words.'''
                 'total_budget': self.perceived_data['budget'],
                 'dates': f"{self.perceived_data['dates']['start']} to {self.perceived_data['dates']['end']}",
                 'travel_style': self.user_input['travel_style'],
-                'interests': self.perceived_data['interests']
+                'interests': self.perceived_data['interests'],
+                'travelers': describe_party(self.party)
             },
+            'party': self.party,
             'budget_breakdown': self.reasoning_output['budget_strategy'],
+            'budget_split': self.reasoning_output['budget_split'],
             'actual_costs': {
                 'flights': flight_cost,
                 'hotels': hotel_cost,
                 'activities_food': activities_cost,
-                'total_used': flight_cost + hotel_cost + activities_cost
+                'total_used': ledger.totals()['total']
             },
-            'flight': self.reasoning_output['selected_flight'],
-            'hotel': self.reasoning_output['selected_hotel'],
-            'all_flights': self.perceived_data['flights'][:5],
-            'all_hotels': self.perceived_data['hotels'][:5],
+            'ledger': ledger.to_dict(),
+            'flight': compact_flight(self.reasoning_output['selected_flight']),
+            'hotel': compact_hotel(self.reasoning_output['selected_hotel']),
+            'alt_flights': [compact_flight(f) for f in self.perceived_data['flights'][1:4]],
+            'alt_hotels': [compact_hotel(h) for h in self.perceived_data['hotels'][1:4]],
             'itinerary': self.itinerary_plan,
-            'weather_summary': self.perceived_data['weather'],
-            'insights': self._generate_insights(),
+            'weather': compact_weather(self._daily_weather()),
+            'raw_refs': {
+                'flights': flights_cache_key(origin, destination,
+                                             self.perceived_data['dates']['start'], self.perceived_data['dates']['end'],
+                                             self.party['adults'], self.party['children']),
+                'hotels': hotels_cache_key(destination,
+                                           self.perceived_data['dates']['start'], self.perceived_data['dates']['end'],
+                                           self.party['adults'], self.party['rooms']),
+                'weather': forecast_cache_key(destination)
+            },
+            'insights': self._generate_insights(ledger),
             'reasoning': self.reasoning_output['reasoning_summary']
         }
         
-        st.success("✅ Action Complete!")
         return self.final_output
     
-    def _generate_insights(self):
-        total_cost = sum([day['total_cost'] for day in self.itinerary_plan.values()])
+    def _build_ledger(self):
+        '''Record every planned cost once, converted to the base currency'''
+        ledger = CostLedger(self.fx_rates)
+        
+        flight = self.reasoning_output['selected_flight']
+        if flight:
+            ledger.add('flights', f"Flight {flight.get('id', '')}".strip(),
+                       flight['price']['total'], flight['price'].get('currency'))
+        
+        hotel = self.reasoning_output['selected_hotel']
+        if hotel:
+            price = hotel['offers'][0]['price']
+            ledger.add('hotels', hotel['hotel']['name'], price['total'], price.get('currency'))
+        
+        for day in self.itinerary_plan.values():
+            ledger.add('activities', day['morning']['activity'], day['morning']['cost'], day=day['day_number'])
+            ledger.add('activities', day['afternoon']['activity'], day['afternoon']['cost'], day=day['day_number'])
+            ledger.add('food', day['evening']['activity'], day['evening']['cost'], day=day['day_number'])
+        
+        return ledger
+    
+    def _generate_insights(self, ledger):
+        totals = ledger.totals()
         budget = self.perceived_data['budget']
         duration = self.perceived_data['dates']['duration']
         
-        flight_cost = float(self.reasoning_output['selected_flight']['price']['total']) if self.reasoning_output['selected_flight'] else 0
-        hotel_cost = float(self.reasoning_output['selected_hotel']['offers'][0]['price']['total']) if self.reasoning_output['selected_hotel'] else 0
-        total_planned = flight_cost + hotel_cost + total_cost
+        total_cost = sum(totals['by_day'].values())
+        total_planned = totals['total']
         
-        peak_days = [f"Day {day['day_number']}" for day in self.itinerary_plan.values() if day['total_cost'] > (total_cost / duration) * 1.2]
+        peak_days = [f"Day {day}" for day, cost in totals['by_day'].items() if cost > (total_cost / duration) * 1.2]
         
-        weather_data = self.perceived_data['weather']['list']
-        rain_days = [w['dt_txt'] for w in weather_data if 'Rain' in w['weather'][0]['main']]
+        rain_days = [date for date, w in self._daily_weather()
+                     if w['source'] == 'forecast' and 'Rain' in w['condition']]
         
         return {
             'cost_savings': f"AI-optimized: {((budget - total_planned) / budget * 100):.1f}% under budget" if total_planned < budget else "Budget utilized",
@@ -279,9 +345,10 @@ Provide brief recommendations in 150 words.'''
             'peak_days': peak_days if peak_days else ['Balanced'],
             'weather_alerts': rain_days[:3] if rain_days else ['No rain expected'],
             'budget_utilization': f"{(total_planned / budget) * 100:.1f}%",
-            'daily_average': f"${total_cost / duration:.2f}",
+            'daily_average': format_money(total_cost / duration, ledger.currency),
+            'per_person_cost': round(total_planned / travelers(self.party), 2),
             'recommendations': [
-                f"Best flight saves ${50 + (duration * 10):.0f}",
+                f"Best flight saves {format_money(50 + duration * 10, ledger.currency)}",
                 "Book 2-3 months advance for 15-20% savings",
                 f"Your {', '.join(self.perceived_data['interests'][:2])} interests covered",
                 "Travel insurance recommended" if rain_days else "Weather favorable",
@@ -1,29 +1,116 @@
 import requests
-import streamlit as st
 from datetime import datetime, timedelta
 import json
+from providers import register_provider, register_fallback, hedging, mark_round_trip, notify
+from circuit_breaker import get_breaker
+from cache import response_cache, cache_key
+from cassettes import play, replaying, CassetteMiss
+from city_index import CITY_INDEX
+from group import party, cost_units, adults_per_room
+from prompts import prompt_key, render_prompt, generate
+from ledger import format_money
 
-def get_flights(apis, origin, destination, start_date, end_date):
-    '''Fetch flight data from Amadeus API or simulate'''
-    if apis['amadeus']:
+# Days covered by the OpenWeather 5-day forecast; later days use climatology
+FORECAST_HORIZON_DAYS = 5
+
+AMADEUS_BREAKER = get_breaker('amadeus')
+WEATHER_BREAKER = get_breaker('openweather')
+GEMINI_BREAKER = get_breaker('gemini')
+
+def _provider_enabled(apis, name):
+    '''A provider is usable with a configured client, or when replaying cassettes'''
+    return bool(apis[name]) or replaying()
+
+def _fetch(provider, key, fn):
+    '''Serve a request from the response cache, going through the cassette layer on a miss.
+
+    Hedged duplicates skip the in-flight join; otherwise they would just wait on the
+    slow request they are meant to race. Only misses count towards the provider's
+    hedging latency.
+    '''
+    def round_trip():
+        mark_round_trip()
+        return play(provider, key, fn)
+    
+    return response_cache.fetch(key, round_trip, join=not hedging())
+
+def flights_cache_key(origin, destination, start_date, end_date, adults=1, children=0):
+    return cache_key('amadeus.flights', origin, destination, start_date, end_date, f'{adults}a{children}c')
+
+def hotels_cache_key(destination, start_date, end_date, adults=1, rooms=1):
+    return cache_key('amadeus.hotels', destination, start_date, end_date, f'{adults}a{rooms}r')
+
+def forecast_cache_key(destination):
+    return cache_key('openweather.forecast', destination)
+
+def city_ref(name, city_id=None):
+    '''Cache key component for a city: its canonical ID when known, else the typed name'''
+    return city_id or name
+
+def request_cache_keys(query):
+    '''All response cache keys a plan request may read'''
+    origin = city_ref(query['origin'], query.get('origin_id'))
+    destination = city_ref(query['destination'], query.get('destination_id'))
+    group = party(query)
+    return [
+        flights_cache_key(origin, destination, query['start_date'], query['end_date'],
+                          group['adults'], group['children']),
+        hotels_cache_key(destination, query['start_date'], query['end_date'], group['adults'], group['rooms']),
+        forecast_cache_key(destination),
+        cache_key('amadeus.city', query['destination']),
+        cache_key('amadeus.activities', destination),
+        cache_key(prompt_key('attractions'), destination, '|'.join(sorted(query['interests'])))
+    ]
+
+def resolve_city(apis, destination, city_id=None):
+    '''Resolve a city to its Amadeus location record: bundled index first, then a cached lookup'''
+    city = CITY_INDEX.get(city_id)
+    if city:
+        return {'iataCode': city.id, 'geoCode': {'latitude': city.lat, 'longitude': city.lon}}
+    
+    def lookup():
+        response = apis['amadeus'].reference_data.locations.get(
+            keyword=destination,
+            subType='CITY'
+        )
+        return response.data[0] if response.data else None
+    
+    return _fetch('amadeus', cache_key('amadeus.city', destination), lookup)
+
+def get_flights(apis, origin, destination, start_date, end_date, origin_id=None, destination_id=None,
+                adults=1, children=0):
+    '''Fetch flight offers priced for the whole party in one Amadeus call, or simulate'''
+    key = flights_cache_key(city_ref(origin, origin_id), city_ref(destination, destination_id),
+                            start_date, end_date, adults, children)
+    cached = response_cache.peek(key)
+    if cached is not None:
+        return cached
+    
+    if _provider_enabled(apis, 'amadeus') and AMADEUS_BREAKER.allow():
         try:
-            response = apis['amadeus'].shopping.flight_offers_search.get(
-                originLocationCode=origin[:3].upper(),
-                destinationLocationCode=destination[:3].upper(),
-                departureDate=start_date,
-                returnDate=end_date,
-                adults=1,
-                max=5
-            )
-            return response.data
+            with AMADEUS_BREAKER.track(ignore=(CassetteMiss,)):
+                flights = _fetch('amadeus', key, lambda: apis['amadeus'].shopping.flight_offers_search.get(
+                    originLocationCode=origin_id or origin[:3].upper(),
+                    destinationLocationCode=destination_id or destination[:3].upper(),
+                    departureDate=start_date,
+                    returnDate=end_date,
+                    adults=adults,
+                    max=5,
+                    **({'children': children} if children else {})
+                ).data)
+            return flights
         except Exception as e:
-            st.warning(f"Using simulated flight data: {str(e)}")
+            notify(f"Using simulated flight data: {str(e)}")
     
-    # Simulated flight data
+    return simulate_flights(origin, destination, start_date, adults, children)
+
+def simulate_flights(origin, destination, start_date, adults=1, children=0):
+    '''Simulated flight data, priced for the whole party'''
+    units = cost_units({'adults': adults, 'children': children})
     return [
         {
             'id': f'FLIGHT_{i}',
-            'price': {'total': str(300 + i*75), 'currency': 'USD'},
+            'price': {'total': f'{(300 + i*75) * units:.2f}', 'currency': 'USD'},
             'itineraries': [{
                 'duration': f'PT{5+i}H{30+(i*10)}M',
                 'segments': [{
@@ -44,27 +131,36 @@ def get_flights(apis, origin, destination, start_date, end_date):
         } for i in range(5)
     ]
 
-def get_hotels(apis, destination, start_date, end_date, duration):
-    '''Fetch hotel data from Amadeus API or simulate'''
-    if apis['amadeus']:
+def get_hotels(apis, destination, start_date, end_date, duration, destination_id=None, adults=1, rooms=1):
+    '''Fetch hotel offers for all rooms of the party in one Amadeus call, or simulate'''
+    key = hotels_cache_key(city_ref(destination, destination_id), start_date, end_date, adults, rooms)
+    per_room = adults_per_room({'adults': adults, 'rooms': rooms})
+    cached = response_cache.peek(key)
+    if cached is not None:
+        return cached
+    
+    if _provider_enabled(apis, 'amadeus') and AMADEUS_BREAKER.allow():
         try:
-            city_response = apis['amadeus'].reference_data.locations.get(
-                keyword=destination,
-                subType='CITY'
-            )
-            if city_response.data:
-                city_code = city_response.data[0]['iataCode']
-                hotel_response = apis['amadeus'].shopping.hotel_offers.get(
-                    cityCode=city_code,
-                    checkInDate=start_date,
-                    checkOutDate=end_date,
-                    adults=1
-                )
-                return hotel_response.data[:5]
+            with AMADEUS_BREAKER.track(ignore=(CassetteMiss,)):
+                city = resolve_city(apis, destination, destination_id)
+                hotels = None
+                if city:
+                    hotels = _fetch('amadeus', key, lambda: apis['amadeus'].shopping.hotel_offers.get(
+                        cityCode=city['iataCode'],
+                        checkInDate=start_date,
+                        checkOutDate=end_date,
+                        adults=per_room,
+                        roomQuantity=rooms
+                    ).data[:5])
+            if hotels is not None:
+                return hotels
         except Exception as e:
-            st.warning(f"Using simulated hotel data: {str(e)}")
+            notify(f"Using simulated hotel data: {str(e)}")
     
-    # Simulated hotel data
+    return simulate_hotels(destination, start_date, end_date, duration, adults, rooms)
+
+def simulate_hotels(destination, start_date, end_date, duration, adults=1, rooms=1):
+    '''Simulated hotel data, priced for all rooms'''
     hotel_types = ['Budget Inn', 'Comfort Hotel', 'Grand Plaza', 'Premium Suites', 'Elite Resort']
     room_types = ['Standard Room', 'Deluxe Room', 'Superior Room', 'Executive Suite', 'Luxury Suite']
     
@@ -80,7 +176,7 @@ def get_hotels(apis, destination, start_date, end_date, duration):
                 'checkInDate': start_date,
                 'checkOutDate': end_date,
                 'price': {
-                    'total': str((80 + i*40) * duration),
+                    'total': str((80 + i*40) * duration * rooms),
                     'currency': 'USD',
                     'base': str(80 + i*40)
                 },
@@ -88,32 +184,49 @@ def get_hotels(apis, destination, start_date, end_date, duration):
                     'type': 'STANDARD',
                     'description': {'text': room_types[i]}
                 },
-                'guests': {'adults': 1}
+                'roomQuantity': rooms,
+                'guests': {'adults': adults_per_room({'adults': adults, 'rooms': rooms})}
             }],
             'amenities': ['WiFi', 'Breakfast', 'Pool', 'Gym', 'Spa'][:i+2]
         } for i in range(5)
     ]
 
-def get_weather(apis, destination, start_date, duration):
+def get_weather(apis, destination, start_date, duration, destination_id=None):
     '''Fetch weather data from OpenWeather API or simulate'''
-    if apis['weather_key']:
+    key = forecast_cache_key(city_ref(destination, destination_id))
+    cached = response_cache.peek(key)
+    if cached is not None:
+        return cached
+    
+    if _provider_enabled(apis, 'weather_key') and WEATHER_BREAKER.allow():
         try:
-            url = f"http://api.openweathermap.org/data/2.5/forecast?q={destination}&appid={apis['weather_key']}&units=metric"
-            response = requests.get(url, timeout=5)
-            if response.status_code == 200:
+            city = CITY_INDEX.get(destination_id)
+            location = f"lat={city.lat}&lon={city.lon}" if city else f"q={destination}"
+            url = f"http://api.openweathermap.org/data/2.5/forecast?{location}&appid={apis['weather_key']}&units=metric"
+            
+            def fetch_forecast():
+                response = requests.get(url, timeout=5)
+                response.raise_for_status()
                 return response.json()
+            
+            with WEATHER_BREAKER.track(ignore=(CassetteMiss,)):
+                return _fetch('openweather', key, fetch_forecast)
         except Exception as e:
-            st.warning(f"Using simulated weather data: {str(e)}")
+            notify(f"Using simulated weather data: {str(e)}")
     
-    # Simulated weather data
-    days = min(duration, 5)
+    return simulate_weather(destination)
+
+def simulate_weather(destination):
+    '''Simulated 5-day forecast counted from today, like the real one; trip days beyond
+    it fall back to climatology'''
+    today = datetime.now()
     conditions = ['Clear', 'Partly Cloudy', 'Cloudy', 'Light Rain', 'Sunny']
     
     return {
         'list': [
             {
-                'dt': int((datetime.now() + timedelta(days=i)).timestamp()),
-                'dt_txt': (datetime.strptime(start_date, '%Y-%m-%d') + timedelta(days=i)).strftime('%Y-%m-%d'),
+                'dt': int((today + timedelta(days=i)).timestamp()),
+                'dt_txt': (today + timedelta(days=i)).strftime('%Y-%m-%d'),
                 'main': {
                     'temp': 18 + (i * 2) + (i % 2 * 3),
                     'feels_like': 17 + (i * 2),
@@ -127,7 +240,7 @@ def get_weather(apis, destination, start_date, duration):
                     'icon': '01d'
                 }],
                 'wind': {'speed': 3.5 + i}
-            } for i in range(days)
+            } for i in range(FORECAST_HORIZON_DAYS)
         ],
         'city': {
             'name': destination,
@@ -135,122 +248,141 @@ def get_weather(apis, destination, start_date, duration):
         }
     }
 
-def get_attractions_from_amadeus(apis, destination):
+def get_attractions_from_amadeus(apis, destination, destination_id=None):
     '''Fetch attractions from Amadeus API'''
-    if apis['amadeus']:
+    key = cache_key('amadeus.activities', city_ref(destination, destination_id))
+    activities = response_cache.peek(key)
+    
+    if activities is None and _provider_enabled(apis, 'amadeus') and AMADEUS_BREAKER.allow():
         try:
-            location_response = apis['amadeus'].reference_data.locations.get(
-                keyword=destination,
-                subType='CITY'
-            )
-            
-            if location_response.data:
-                lat = location_response.data[0]['geoCode']['latitude']
-                lon = location_response.data[0]['geoCode']['longitude']
-                
-                poi_response = apis['amadeus'].shopping.activities.get(
-                    latitude=lat,
-                    longitude=lon
-                )
-                
-                attractions = []
-                for activity in poi_response.data[:15]:
-                    attractions.append({
-                        'name': activity.get('name', 'Attraction'),
-                        'rating': activity.get('rating', 4.5),
-                        'price': float(activity.get('price', {}).get('amount', 20)),
-                        'duration': activity.get('duration', '2-3 hours'),
-                        'description': activity.get('shortDescription', 'Popular attraction')
-                    })
-                
-                return attractions
+            with AMADEUS_BREAKER.track(ignore=(CassetteMiss,)):
+                city = resolve_city(apis, destination, destination_id)
+                if city:
+                    activities = _fetch('amadeus', key, lambda: apis['amadeus'].shopping.activities.get(
+                        latitude=city['geoCode']['latitude'],
+                        longitude=city['geoCode']['longitude']
+                    ).data)
         except Exception as e:
-            st.warning(f"Amadeus POI fetch failed: {str(e)}")
+            notify(f"Amadeus POI fetch failed: {str(e)}")
+    
+    if activities is not None:
+        attractions = []
+        for activity in activities[:15]:
+            attractions.append({
+                'name': activity.get('name', 'Attraction'),
+                'rating': activity.get('rating', 4.5),
+                'price': float(activity.get('price', {}).get('amount', 20)),
+                'duration': activity.get('duration', '2-3 hours'),
+                'description': activity.get('shortDescription', 'Popular attraction')
+            })
+        
+        return attractions
     
     return None
 
-def get_attractions_from_gemini(apis, destination, interests):
+def get_attractions_from_gemini(apis, destination, interests, destination_id=None, llm_budget=None):
     '''Generate attractions using Gemini AI'''
-    if apis['gemini']:
+    key = cache_key(prompt_key('attractions'), city_ref(destination, destination_id), '|'.join(sorted(interests)))
+    cached = response_cache.peek(key)
+    if cached is not None:
+        return cached
+    
+    city = CITY_INDEX.get(destination_id)
+    place = ', '.join(p for p in (city.name, city.region, city.country) if p) if city else destination
+    prompt = render_prompt('attractions', place=place, interests=', '.join(interests))
+    
+    if (_provider_enabled(apis, 'gemini') and (llm_budget is None or llm_budget.allows('attractions', prompt))
+            and GEMINI_BREAKER.allow()):
         try:
-            prompt = f'''
-Generate a list of 15 real, popular attractions in {destination} that match these interests: {', '.join(interests)}.
-
-For each attraction, provide in this EXACT JSON format:
-[
-  {{"name": "Attraction Name", "rating": 4.5, "price": 20, "duration": "2-3 hours", "description": "brief description"}},
-  ...
-]
-
-Rules:
-- Include REAL places that exist in {destination}
-- Mix of free and paid attractions
-- Prices in USD
-- Variety of durations
-- Match user interests: {', '.join(interests)}
-
-Return ONLY the JSON array, no other text.
-'''
-            response = apis['gemini'].generate_content(prompt)
-            response_text = response.text.strip()
-            
-            if '```json' in response_text:
-                response_text = response_text.split('```json')[1].split('```')[0].strip()
-            elif '```' in response_text:
-                response_text = response_text.split('```')[1].split('```')[0].strip()
+            def fetch():
+                response_text = generate(apis['gemini'], 'attractions', prompt, llm_budget).strip()
+                
+                if '```json' in response_text:
+                    response_text = response_text.split('```json')[1].split('```')[0].strip()
+                elif '```' in response_text:
+                    response_text = response_text.split('```')[1].split('```')[0].strip()
+                
+                return json.loads(response_text)
             
-            return json.loads(response_text)
+            with GEMINI_BREAKER.track(ignore=(CassetteMiss,)):
+                return _fetch('gemini', key, fetch)
         except Exception as e:
-            st.warning(f"AI attraction generation failed: {str(e)}")
+            notify(f"AI attraction generation failed: {str(e)}")
     
     return None
 
+def get_reasoning_from_gemini(apis, destination, budget, duration, interests, llm_budget=None):
+    '''Generate trip recommendations text using Gemini AI'''
+    key = cache_key(prompt_key('reasoning'), destination, budget, duration, '|'.join(sorted(interests)))
+    cached = response_cache.peek(key)
+    if cached is not None:
+        return cached
+    
+    prompt = render_prompt('reasoning', destination=destination, budget=format_money(budget), duration=duration,
+                           interests=', '.join(interests))
+    
+    if (_provider_enabled(apis, 'gemini') and (llm_budget is None or llm_budget.allows('reasoning', prompt))
+            and GEMINI_BREAKER.allow()):
+        try:
+            with GEMINI_BREAKER.track(ignore=(CassetteMiss,)):
+                return _fetch('gemini', key, lambda: generate(apis['gemini'], 'reasoning', prompt, llm_budget))
+        except Exception:
+            pass
+    
+    return None
+
+ATTRACTION_TEMPLATES = {
+    'Culture & Art': [
+        ('{destination} National Museum', 15, '2-3 hours', 'Main museum featuring local art'),
+        ('{destination} Art Gallery', 12, '1-2 hours', 'Contemporary art exhibitions'),
+        ('Cultural Quarter of {destination}', 0, '2-3 hours', 'Historic cultural district')
+    ],
+    'Food & Gastronomy': [
+        ('{destination} Food Market', 0, '2 hours', 'Famous local food market'),
+        ('Cooking Class in {destination}', 75, '3-4 hours', 'Learn traditional cooking'),
+        ('{destination} Street Food Tour', 45, '3 hours', 'Best street food spots')
+    ],
+    'Adventure & Outdoor': [
+        ('{destination} Outdoor Park', 0, '3-4 hours', 'Popular outdoor park'),
+        ('Adventure Activities near {destination}', 60, '4 hours', 'Hiking and sports'),
+        ('{destination} Nature Trail', 10, '2-3 hours', 'Scenic trails')
+    ],
+    'History & Heritage': [
+        ('Historic Center of {destination}', 0, '3 hours', 'Heritage landmarks'),
+        ('{destination} Historical Museum', 15, '2 hours', 'City history museum'),
+        ('Heritage Walking Tour {destination}', 25, '2.5 hours', 'Guided historic tour')
+    ],
+    'Shopping': [
+        ('{destination} Main Shopping Street', 0, '2-3 hours', 'Popular shopping'),
+        ('{destination} Local Market', 0, '2 hours', 'Traditional market'),
+        ('{destination} Shopping Mall', 0, '3 hours', 'Modern shopping center')
+    ],
+    'Nature & Wildlife': [
+        ('{destination} Botanical Garden', 10, '2 hours', 'Beautiful gardens'),
+        ('{destination} Zoo/Wildlife Park', 25, '3-4 hours', 'Wildlife attraction'),
+        ('Nature Reserve near {destination}', 15, '3 hours', 'Protected area')
+    ],
+    'Relaxation': [
+        ('{destination} Spa Center', 80, '2-3 hours', 'Wellness treatments'),
+        ('{destination} Waterfront', 0, '2-3 hours', 'Relaxing waterfront'),
+        ('{destination} Viewpoint', 0, '1-2 hours', 'Best sunset views')
+    ]
+}
+
+UNIVERSAL_ATTRACTIONS = [
+    ('{destination} City Center', 0, '2-3 hours', 4.6, 'Main city center'),
+    ('Best Restaurants in {destination}', 40, '2 hours', 4.7, 'Top dining'),
+    ('{destination} Observation Deck', 20, '1 hour', 4.5, 'Panoramic views'),
+]
+
 def generate_generic_attractions(destination, interests):
     '''Generate generic but contextual attractions'''
-    attraction_templates = {
-        'Culture & Art': [
-            (f'{destination} National Museum', 15, '2-3 hours', 'Main museum featuring local art'),
-            (f'{destination} Art Gallery', 12, '1-2 hours', 'Contemporary art exhibitions'),
-            (f'Cultural Quarter of {destination}', 0, '2-3 hours', 'Historic cultural district')
-        ],
-        'Food & Gastronomy': [
-            (f'{destination} Food Market', 0, '2 hours', 'Famous local food market'),
-            (f'Cooking Class in {destination}', 75, '3-4 hours', 'Learn traditional cooking'),
-            (f'{destination} Street Food Tour', 45, '3 hours', 'Best street food spots')
-        ],
-        'Adventure & Outdoor': [
-            (f'{destination} Outdoor Park', 0, '3-4 hours', 'Popular outdoor park'),
-            (f'Adventure Activities near {destination}', 60, '4 hours', 'Hiking and sports'),
-            (f'{destination} Nature Trail', 10, '2-3 hours', 'Scenic trails')
-        ],
-        'History & Heritage': [
-            (f'Historic Center of {destination}', 0, '3 hours', 'Heritage landmarks'),
-            (f'{destination} Historical Museum', 15, '2 hours', 'City history museum'),
-            (f'Heritage Walking Tour {destination}', 25, '2.5 hours', 'Guided historic tour')
-        ],
-        'Shopping': [
-            (f'{destination} Main Shopping Street', 0, '2-3 hours', 'Popular shopping'),
-            (f'{destination} Local Market', 0, '2 hours', 'Traditional market'),
-            (f'{destination} Shopping Mall', 0, '3 hours', 'Modern shopping center')
-        ],
-        'Nature & Wildlife': [
-            (f'{destination} Botanical Garden', 10, '2 hours', 'Beautiful gardens'),
-            (f'{destination} Zoo/Wildlife Park', 25, '3-4 hours', 'Wildlife attraction'),
-            (f'Nature Reserve near {destination}', 15, '3 hours', 'Protected area')
-        ],
-        'Relaxation': [
-            (f'{destination} Spa Center', 80, '2-3 hours', 'Wellness treatments'),
-            (f'{destination} Waterfront', 0, '2-3 hours', 'Relaxing waterfront'),
-            (f'{destination} Viewpoint', 0, '1-2 hours', 'Best sunset views')
-        ]
-    }
-    
     attractions = []
     for interest in interests:
-        if interest in attraction_templates:
-            for name, price, duration, desc in attraction_templates[interest]:
+        if interest in ATTRACTION_TEMPLATES:
+            for name, price, duration, desc in ATTRACTION_TEMPLATES[interest]:
                 attractions.append({
-                    'name': name,
+                    'name': name.format(destination=destination),
                     'rating': round(4.3 + (len(attractions) * 0.1), 1),
                     'price': price,
                     'duration': duration,
@@ -258,19 +390,34 @@ def generate_generic_attractions(destination, interests):
                 })
     
     # Add universal attractions
-    universal = [
-        (f'{destination} City Center', 0, '2-3 hours', 4.6, 'Main city center'),
-        (f'Best Restaurants in {destination}', 40, '2 hours', 4.7, 'Top dining'),
-        (f'{destination} Observation Deck', 20, '1 hour', 4.5, 'Panoramic views'),
-    ]
-    
-    for name, price, duration, rating, desc in universal[:5]:
+    for name, price, duration, rating, desc in UNIVERSAL_ATTRACTIONS[:5]:
         attractions.append({
-            'name': name,
+            'name': name.format(destination=destination),
             'rating': rating,
             'price': price,
             'duration': duration,
             'description': desc
         })
     
-    return attractions[:15]
\ No newline at end of file
+    return attractions[:15]
+
+# Provider registry: fn(apis, query) -> data, raced by providers.race()
+register_provider('flights', 'amadeus', lambda apis, q: get_flights(
+    apis, q['origin'], q['destination'], q['start_date'], q['end_date'],
+    q.get('origin_id'), q.get('destination_id'), party(q)['adults'], party(q)['children']), priority=1)
+register_provider('hotels', 'amadeus', lambda apis, q: get_hotels(
+    apis, q['destination'], q['start_date'], q['end_date'], q['duration'], q.get('destination_id'),
+    party(q)['adults'], party(q)['rooms']), priority=1)
+register_provider('weather', 'openweather', lambda apis, q: get_weather(
+    apis, q['destination'], q['start_date'], q['duration'], q.get('destination_id')), priority=1)
+register_provider('attractions', 'amadeus', lambda apis, q: get_attractions_from_amadeus(
+    apis, q['destination'], q.get('destination_id')), priority=2)
+register_provider('attractions', 'gemini', lambda apis, q: get_attractions_from_gemini(
+    apis, q['destination'], q['interests'], q.get('destination_id'), q.get('llm_budget')), priority=1)
+
+register_fallback('flights', lambda q: simulate_flights(
+    q['origin'], q['destination'], q['start_date'], party(q)['adults'], party(q)['children']))
+register_fallback('hotels', lambda q: simulate_hotels(
+    q['destination'], q['start_date'], q['end_date'], q['duration'], party(q)['adults'], party(q)['rooms']))
+register_fallback('weather', lambda q: simulate_weather(q['destination']))
+register_fallback('attractions', lambda q: generate_generic_attractions(q['destination'], q['interests']))
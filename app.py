@@ -1,11 +1,17 @@
+import time
 import streamlit as st
-from config import setup_page, initialize_apis
+from config import setup_page, initialize_apis, JOB_POLL_SECONDS
 from ui_components import (render_input_form, render_summary_cards,
-    render_insights, render_flights, render_hotels, render_itinerary
+    render_insights, render_flights, render_hotels, render_itinerary,
+    render_provider_health
 )
-from visualizations import render_budget_visualizations, render_weather_charts
+from visualizations import render_budget_visualizations, render_weather_charts, render_scenario_comparison
 from utils import validate_form_data, render_export_section
-from agent import TravelAgent
+from jobs import get_job_manager, ACTIVE_STATES, CANCELLED, FAILED
+from circuit_breaker import all_health
+from metrics import write_metrics
+from prefetch import Prefetcher
+from plan_store import plan_id_for, get_plan
 
 def main():
     # Setup page configuration
@@ -19,82 +25,115 @@ def main():
     # Initialize APIs and render sidebar
     
     apis = initialize_apis()
+    render_provider_health(all_health())
     
     # Render input form
     form_data = render_input_form()
     
-    # Process form submission
+    # Warm provider data in the background while the user is still typing
+    if 'prefetcher' not in st.session_state:
+        st.session_state.prefetcher = Prefetcher(apis)
+    st.session_state.prefetcher.update(form_data)
+    
+    # Process form submission: reuse a stored plan, otherwise enqueue a background plan job
     if form_data['submitted']:
         if not validate_form_data(form_data):
             return
+        st.session_state.prefetcher.cancel_all()
+        st.session_state.pop('job_id', None)
+        plan_id = plan_id_for(form_data)
+        if get_plan(plan_id) is not None:
+            st.query_params['plan'] = plan_id
+        else:
+            st.session_state.job_id = get_job_manager().submit(form_data)
+    
+    job_id = st.session_state.get('job_id')
+    if job_id:
+        job = get_job_manager().status(job_id)
+        if job is None:
+            del st.session_state.job_id
+            return
         
-        # Initialize AI Agent
-        agent = TravelAgent(form_data, apis)
-        
-        # Execute Agentic AI Workflow with progress tracking
-        st.markdown("---")
-        st.header("🤖 AI Agent Working...")
-        
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        with st.spinner("Processing your travel plan..."):
-            # PERCEIVE
-            status_text.text("🔍 Perceiving: Gathering data...")
-            progress_bar.progress(25)
-            agent.perceive()
-            
-            # REASON
-            status_text.text("🧠 Reasoning: Analyzing options...")
-            progress_bar.progress(50)
-            agent.reason()
-            
-            # PLAN
-            status_text.text("📋 Planning: Creating itinerary...")
-            progress_bar.progress(75)
-            agent.plan()
-            
-            # ACT
-            status_text.text("🚀 Acting: Compiling results...")
-            progress_bar.progress(100)
-            result = agent.act()
-        
-        status_text.empty()
-        progress_bar.empty()
-        
-        # Display Results
-        st.success("🎉 Your Personalized Travel Plan is Ready!")
-        st.markdown("---")
-        
-        # AI Reasoning Summary
-        with st.expander("🧠 AI Reasoning & Analysis", expanded=False):
-            st.markdown(result['reasoning'])
-        
-        # Summary Cards
-        render_summary_cards(result)
-        
-        # Budget Visualizations
-        render_budget_visualizations(result)
-        
-        # Key Insights
-        render_insights(result['insights'])
-        
-        # Flight Options
-        render_flights(result)
-        
-        # Hotel Options
-        render_hotels(result)
-        
-        # Day-by-Day Itinerary
-        render_itinerary(result)
-        
-        # Weather Forecast
-        render_weather_charts(result, result['insights'])
-        
-        # Export Options
-        render_export_section(result, form_data['destination'], form_data['start_date'])
+        if job['state'] in ACTIVE_STATES:
+            # Poll the job: show progress, then rerun until it finishes
+            st.markdown("---")
+            st.header("🤖 AI Agent Working...")
+            st.progress(job['progress'])
+            st.text(job['message'])
+            if st.button("🛑 Cancel"):
+                get_job_manager().cancel(job_id)
+            time.sleep(JOB_POLL_SECONDS)
+            st.rerun()
+        
+        if job['state'] == CANCELLED:
+            st.warning("🛑 Plan generation was cancelled.")
+            return
+        if job['state'] == FAILED:
+            st.error(f"⚠️ Plan generation failed: {job['error']}")
+            return
         
-        st.success("✨ **Thank you for using Smart AI Travel Planner!** Have an amazing trip! 🌍✈️")
+        write_metrics()
+        # The worker saved the plan; from here on it is opened from the store by ID
+        del st.session_state.job_id
+        st.query_params['plan'] = job['result']['result']['plan_id']
+        render_results(job['result'], job['request'])
+        return
+    
+    # Shared or previously generated plans load straight from the plan store
+    plan_id = st.query_params.get('plan')
+    if not plan_id:
+        return
+    stored = get_plan(plan_id)
+    if stored is None:
+        st.warning("⚠️ This plan is no longer stored. Submit the form to generate it again.")
+        return
+    render_results(*stored)
+
+def render_results(output, request):
+    result = output['result']
+    
+    # Display Results
+    st.success("🎉 Your Personalized Travel Plan is Ready!")
+    st.markdown("---")
+    
+    st.caption(f"🔗 Share this plan by adding `?plan={result['plan_id']}` to the app URL")
+    
+    for notice in output.get('notices', []):
+        st.warning(f"⚠️ {notice}")
+    
+    # AI Reasoning Summary
+    with st.expander("🧠 AI Reasoning & Analysis", expanded=False):
+        st.markdown(result['reasoning'])
+    
+    # Summary Cards
+    render_summary_cards(result)
+    
+    # Budget Visualizations
+    render_budget_visualizations(result)
+    
+    # Key Insights
+    render_insights(result['insights'])
+    
+    # Flight Options
+    render_flights(result)
+    
+    # Hotel Options
+    render_hotels(result)
+    
+    # Day-by-Day Itinerary
+    render_itinerary(result)
+    
+    # Scenario Comparison
+    if output.get('scenarios'):
+        render_scenario_comparison(output['scenarios'], result['plan_id'])
+    
+    # Weather Forecast
+    render_weather_charts(result, result['insights'])
+    
+    # Export Options
+    render_export_section(result, request['destination'], request['start_date'])
+    
+    st.success("✨ **Thank you for using Smart AI Travel Planner!** Have an amazing trip! 🌍✈️")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,173 @@
+import re
+import json
+import time
+import sqlite3
+import argparse
+from config import (
+    ATTRACTION_STORE_PATH, ATTRACTION_STORE_TTL_DAYS, ATTRACTION_STORE_MIN_RESULTS,
+    INTEREST_CATEGORIES
+)
+from sqlite_store import connect
+from city_index import CITY_INDEX
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS attractions (
+    id INTEGER PRIMARY KEY,
+    city TEXT NOT NULL,
+    name TEXT NOT NULL,
+    rating REAL,
+    price REAL,
+    duration TEXT,
+    description TEXT,
+    interests TEXT,
+    source TEXT,
+    updated_at REAL,
+    UNIQUE(city, name)
+);
+CREATE INDEX IF NOT EXISTS idx_attractions_city_rating ON attractions(city, rating DESC);
+CREATE VIRTUAL TABLE IF NOT EXISTS attractions_fts USING fts5(
+    name, description, interests, content='attractions', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS attractions_ai AFTER INSERT ON attractions BEGIN
+    INSERT INTO attractions_fts(rowid, name, description, interests)
+    VALUES (new.id, new.name, new.description, new.interests);
+END;
+CREATE TRIGGER IF NOT EXISTS attractions_ad AFTER DELETE ON attractions BEGIN
+    INSERT INTO attractions_fts(attractions_fts, rowid, name, description, interests)
+    VALUES ('delete', old.id, old.name, old.description, old.interests);
+END;
+CREATE TRIGGER IF NOT EXISTS attractions_au AFTER UPDATE ON attractions BEGIN
+    INSERT INTO attractions_fts(attractions_fts, rowid, name, description, interests)
+    VALUES ('delete', old.id, old.name, old.description, old.interests);
+    INSERT INTO attractions_fts(rowid, name, description, interests)
+    VALUES (new.id, new.name, new.description, new.interests);
+END;
+'''
+
+def normalize_city(city):
+    return ' '.join(city.lower().split())
+
+def city_id_for(name):
+    '''Canonical city ID for a typed name, code or label ("Paris", "Paris, Texas", "PRX"), if known'''
+    matches = CITY_INDEX.lookup(name)
+    return matches[0].id if matches else None
+
+def interest_tokens(interests):
+    '''Turn interest labels like "Food & Gastronomy" into FTS tokens'''
+    tokens = []
+    for interest in interests:
+        tokens.extend(t for t in re.findall(r'\w+', interest.lower()) if t not in tokens)
+    return tokens
+
+def query_attractions(city, interests, limit=15, path=ATTRACTION_STORE_PATH):
+    '''Return stored attractions for a city ranked by interest match then rating.
+
+    Cities are keyed like the response cache: by canonical city ID when known, else by typed name.
+    '''
+    tokens = interest_tokens(interests)
+    cutoff = time.time() - ATTRACTION_STORE_TTL_DAYS * 86400
+
+    if tokens:
+        match = '{name description interests} : (' + ' OR '.join(f'"{t}"' for t in tokens) + ')'
+        sql = '''
+            SELECT a.name, a.rating, a.price, a.duration, a.description, m.score IS NOT NULL AS matched
+            FROM attractions a
+            LEFT JOIN (
+                SELECT rowid, -bm25(attractions_fts) AS score
+                FROM attractions_fts WHERE attractions_fts MATCH ?
+            ) m ON m.rowid = a.id
+            WHERE a.city = ? AND a.updated_at >= ?
+            ORDER BY m.score IS NOT NULL DESC, a.rating DESC, m.score DESC
+            LIMIT ?
+        '''
+        params = (match, normalize_city(city), cutoff, limit)
+    else:
+        sql = '''
+            SELECT name, rating, price, duration, description FROM attractions
+            WHERE city = ? AND updated_at >= ?
+            ORDER BY rating DESC LIMIT ?
+        '''
+        params = (normalize_city(city), cutoff, limit)
+
+    try:
+        with connect(path, SCHEMA) as conn:
+            rows = conn.execute(sql, params).fetchall()
+    except sqlite3.Error:
+        return None
+
+    # With interests, only rows that match them count towards the minimum; a city
+    # stored for other interests should still go to the providers
+    matched = sum(row['matched'] for row in rows) if tokens else len(rows)
+    if matched < ATTRACTION_STORE_MIN_RESULTS:
+        return None
+    return [{k: row[k] for k in ('name', 'rating', 'price', 'duration', 'description')} for row in rows]
+
+def save_attractions(city, attractions, interests=(), source='unknown', path=ATTRACTION_STORE_PATH):
+    '''Insert or refresh attractions for a city'''
+    now = time.time()
+    tags = ' '.join(interest_tokens(interests))
+    try:
+        with connect(path, SCHEMA) as conn:
+            conn.executemany('''
+                INSERT INTO attractions (city, name, rating, price, duration, description, interests, source, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(city, name) DO UPDATE SET
+                    rating = excluded.rating, price = excluded.price, duration = excluded.duration,
+                    description = excluded.description, source = excluded.source,
+                    updated_at = excluded.updated_at,
+                    interests = CASE WHEN instr(attractions.interests, excluded.interests) > 0
+                        THEN attractions.interests
+                        ELSE TRIM(attractions.interests || ' ' || excluded.interests) END
+            ''', [
+                (normalize_city(city), a['name'], float(a.get('rating', 4.5)), float(a.get('price', 0)),
+                 a.get('duration', ''), a.get('description', ''), tags, source, now)
+                for a in attractions
+            ])
+        return True
+    except sqlite3.Error:
+        return False
+
+def load_bundled(json_path, path=ATTRACTION_STORE_PATH):
+    '''Load bundled data: {"City": [{"name": ..., "interests": [...], ...}, ...]}'''
+    with open(json_path, encoding='utf-8') as f:
+        bundled = json.load(f)
+
+    count = 0
+    for city, attractions in bundled.items():
+        for attraction in attractions:
+            save_attractions(city_id_for(city) or city, [attraction], attraction.get('interests', ()), 'bundled', path)
+            count += 1
+    return count
+
+def warm_up(apis, destinations, interests=INTEREST_CATEGORIES, path=ATTRACTION_STORE_PATH):
+    '''Fill the store from Amadeus and Gemini for a list of destinations'''
+    from api_handlers import get_attractions_from_amadeus, get_attractions_from_gemini
+
+    summary = {}
+    for destination in destinations:
+        count = 0
+        city_id = city_id_for(destination)
+        city = city_id or destination
+        amadeus = get_attractions_from_amadeus(apis, destination, city_id)
+        if amadeus and save_attractions(city, amadeus, (), 'amadeus', path):
+            count += len(amadeus)
+        for interest in interests:
+            gemini = get_attractions_from_gemini(apis, destination, [interest], city_id)
+            if gemini and save_attractions(city, gemini, [interest], 'gemini', path):
+                count += len(gemini)
+        summary[destination] = count
+    return summary
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Warm up the local attraction store")
+    parser.add_argument('destinations', nargs='*', help="Cities to fetch from Amadeus/Gemini")
+    parser.add_argument('--bundled', help="JSON file of bundled attraction data")
+    parser.add_argument('--db', default=ATTRACTION_STORE_PATH, help="Store path")
+    args = parser.parse_args()
+
+    if args.bundled:
+        print(f"Loaded {load_bundled(args.bundled, args.db)} bundled attractions")
+    if args.destinations:
+        from config import initialize_apis
+        for destination, count in warm_up(initialize_apis(), args.destinations, path=args.db).items():
+            print(f"{destination}: {count} attractions stored")
@@ -0,0 +1,307 @@
+'''Concurrent-session load test: N simulated users planning trips against one app instance.
+
+Each simulated user runs the full TravelAgent pipeline (perceive, reason,
+plan, act, optional scenario comparison) followed by the render path that
+does not need a browser (export generation and a plan store round trip),
+back to back until the level's duration is up. Users share one process and
+its caches, provider pool and circuit breakers, the way Streamlit sessions
+share a server.
+
+Providers are local stand-ins with configurable latency and error rate, or
+recorded cassettes with --providers replay. Weather has no client object
+to stand in for, so with stand-ins it comes from the built-in simulator.
+
+Run from the repository root:
+    python benchmarks/loadtest.py --levels 1,4,8,16 --duration 30 --ramp-up 5
+'''
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import resource
+import tempfile
+import threading
+import warnings
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+STAGES = ('perceive', 'reason', 'plan', 'act', 'scenarios', 'render')
+DESTINATIONS = [('Paris', 'London'), ('Tokyo', 'Singapore'), ('Rome', 'Berlin'), ('Barcelona', 'Amsterdam'),
+                ('Dubai', 'Mumbai'), ('New York', 'Los Angeles'), ('Bangkok', 'Sydney'), ('Istanbul', 'Delhi')]
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--levels', default='1,4,8,16', help='comma-separated concurrent user counts')
+    parser.add_argument('--duration', type=float, default=20, help='seconds to run each level')
+    parser.add_argument('--ramp-up', type=float, default=5, help='seconds over which users of a level start')
+    parser.add_argument('--providers', choices=('standin', 'replay'), default='standin')
+    parser.add_argument('--latency', type=float, default=0.3, help='median stand-in provider latency (s)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='stand-in provider error probability')
+    parser.add_argument('--unique-requests', type=int, default=0,
+                        help='distinct requests per level (0 = every plan is a new request)')
+    parser.add_argument('--scenarios', action='store_true', help='also run the scenario comparison')
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--report', default='loadtest_report.json')
+    return parser.parse_args()
+
+class _Response:
+    def __init__(self, data):
+        self.data = data
+        self.text = data if isinstance(data, str) else json.dumps(data)
+
+class _Endpoint:
+    '''One stand-in API endpoint: sleeps for a lognormal latency, then answers or fails'''
+
+    def __init__(self, standin, fn):
+        self.standin = standin
+        self.fn = fn
+
+    def get(self, **params):
+        return _Response(self.standin.call(self.fn, params))
+
+class _Namespace:
+    pass
+
+class StandInProviders:
+    '''Local stand-ins for the Amadeus and Gemini clients'''
+
+    def __init__(self, latency, error_rate, seed):
+        from plan_memory import amadeus_flight, amadeus_hotel
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+
+        amadeus = _Namespace()
+        amadeus.shopping = _Namespace()
+        amadeus.reference_data = _Namespace()
+        amadeus.reference_data.locations = _Endpoint(self, lambda p: [
+            {'iataCode': p.get('keyword', 'XXX')[:3].upper(), 'geoCode': {'latitude': 48.85, 'longitude': 2.35}}
+        ])
+        amadeus.shopping.flight_offers_search = _Endpoint(self, lambda p: [amadeus_flight(i) for i in range(5)])
+        amadeus.shopping.hotel_offers = _Endpoint(self, lambda p: [amadeus_hotel(i) for i in range(5)])
+        amadeus.shopping.activities = _Endpoint(self, lambda p: [
+            {'name': f'Landmark {i}', 'rating': 4.0 + i % 10 / 10, 'price': {'amount': str(10 + i * 5)},
+             'shortDescription': 'A popular sight.'} for i in range(12)
+        ])
+        self.amadeus = amadeus
+
+    def call(self, fn, params):
+        with self.lock:
+            delay = self.latency * self.rng.lognormvariate(0, 0.5)
+            failed = self.rng.random() < self.error_rate
+        time.sleep(delay)
+        if failed:
+            raise ConnectionError('stand-in provider error')
+        return fn(params)
+
+    def generate_content(self, prompt, generation_config=None, request_options=None):
+        if 'JSON' in prompt:
+            return _Response(self.call(lambda p: json.dumps([
+                {'name': f'Attraction {i}', 'rating': 4.5, 'price': 15 + i, 'duration': '2 hours',
+                 'description': 'A well-reviewed spot.'} for i in range(15)
+            ]), {}))
+        return _Response(self.call(lambda p: 'Spend on experiences, save on transport.', {}))
+
+    def apis(self):
+        return {'gemini': self, 'amadeus': self.amadeus, 'weather_key': None}
+
+def make_request(rng, n):
+    from city_index import CITY_INDEX
+    from config import INTEREST_CATEGORIES
+    destination, origin = (CITY_INDEX.lookup(name)[0] for name in DESTINATIONS[n % len(DESTINATIONS)])
+    start = date.today() + timedelta(days=14 + n // len(DESTINATIONS))
+    adults = rng.choice([1, 2, 2, 4])
+    return {
+        'destination': destination.name, 'destination_id': destination.id,
+        'origin': origin.name, 'origin_id': origin.id,
+        'start_date': start.isoformat(),
+        'end_date': (start + timedelta(days=rng.choice([3, 5, 7, 10]))).isoformat(),
+        'budget': rng.choice([1500, 2500, 4000]),
+        'adults': adults, 'children': rng.choice([0, 0, 1, 2]) if adults > 1 else 0,
+        'rooms': max(1, adults // 2),
+        'interests': rng.sample(INTEREST_CATEGORIES, 2),
+        'travel_style': rng.choice(['budget', 'mid-range', 'luxury']),
+        'pace': 'moderate', 'compare_scenarios': False
+    }
+
+def current_rss_mb():
+    '''Resident set size now, falling back to the peak when /proc is unavailable'''
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+def run_plan(request, apis, with_scenarios):
+    '''One user's plan: (stage timings, error string or None)'''
+    from agent import TravelAgent
+    from scenarios import run_scenarios
+    from utils import generate_export_data
+    from plan_store import save_plan, get_plan
+
+    timings = {}
+    agent = TravelAgent(request, apis)
+    stage = None
+    try:
+        for stage in ('perceive', 'reason', 'plan', 'act'):
+            start = time.perf_counter()
+            getattr(agent, stage)()
+            timings[stage] = time.perf_counter() - start
+
+        output = {'result': agent.final_output}
+        if with_scenarios:
+            stage = 'scenarios'
+            start = time.perf_counter()
+            output['scenarios'] = run_scenarios(agent)
+            timings['scenarios'] = time.perf_counter() - start
+
+        stage = 'render'
+        start = time.perf_counter()
+        result = agent.final_output
+        save_plan(result['plan_id'], request, output)
+        get_plan(result['plan_id'])
+        generate_export_data(result, request['destination'], request['start_date'])
+        timings['render'] = time.perf_counter() - start
+    except Exception as e:
+        return timings, f'{stage}: {type(e).__name__}: {e}'
+    return timings, None
+
+def run_level(users, args, apis):
+    '''Run `users` concurrent users for args.duration seconds and summarize'''
+    import metrics
+    from cache import response_cache
+
+    response_cache.clear()
+    before = metrics.snapshot()['counters']
+    pool_size = args.unique_requests or None
+    counter = iter(range(10 ** 9))
+    counter_lock = threading.Lock()
+    samples, errors = [], []
+    samples_lock = threading.Lock()
+    stop_at = time.monotonic() + args.ramp_up + args.duration
+    peak_rss = [current_rss_mb()]
+    sampling = threading.Event()
+
+    def sample_rss():
+        while not sampling.wait(0.2):
+            peak_rss[0] = max(peak_rss[0], current_rss_mb())
+
+    def user(index):
+        time.sleep(args.ramp_up * index / max(users, 1))
+        while time.monotonic() < stop_at:
+            with counter_lock:
+                n = next(counter)
+            n = n % pool_size if pool_size else n
+            request = make_request(random.Random(args.seed + n), n)
+            start = time.perf_counter()
+            timings, error = run_plan(request, apis, args.scenarios)
+            timings['total'] = time.perf_counter() - start
+            with samples_lock:
+                samples.append(timings)
+                if error:
+                    errors.append(error)
+
+    sampler = threading.Thread(target=sample_rss, daemon=True)
+    sampler.start()
+    started = time.monotonic()
+    threads = [threading.Thread(target=user, args=(i,), name=f'loadtest-user-{i}') for i in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+    sampling.set()
+    sampler.join()
+
+    after = metrics.snapshot()['counters']
+
+    def delta(name, **labels):
+        return sum(v - before.get(k, 0) for k, v in after.items()
+                   if k[0] == name and all(dict(k[1]).get(l) == val for l, val in labels.items()))
+
+    races = delta('provider_races_total')
+    calls = delta('provider_calls_total')
+    return {
+        'users': users,
+        'plans': len(samples),
+        'elapsed_seconds': round(elapsed, 2),
+        'throughput_plans_per_second': round(len(samples) / elapsed, 3) if elapsed else 0,
+        'error_rate': round(len(errors) / len(samples), 4) if samples else 0,
+        'fallback_rate': round(delta('provider_fallbacks_total') / races, 4) if races else 0,
+        'provider_error_rate': round(delta('provider_calls_total', outcome='failure') / calls, 4) if calls else 0,
+        'llm_tokens_per_plan': round((delta('llm_prompt_tokens_total') + delta('llm_output_tokens_total'))
+                                     / len(samples), 1) if samples else 0,
+        'peak_rss_mb': round(peak_rss[0], 1),
+        'latency_seconds': {
+            stage: {f'p{q}': round(percentile(values, q), 4) for q in (50, 95, 99)}
+            for stage in STAGES + ('total',)
+            for values in [[s[stage] for s in samples if stage in s]] if values
+        },
+        'errors': sorted(set(errors))[:10]
+    }
+
+def print_level(level):
+    print(f"\n{level['users']} users: {level['plans']} plans in {level['elapsed_seconds']}s "
+          f"({level['throughput_plans_per_second']} plans/s), errors {level['error_rate']:.1%}, "
+          f"fallbacks {level['fallback_rate']:.1%}, provider errors {level['provider_error_rate']:.1%}, "
+          f"LLM tokens/plan {level['llm_tokens_per_plan']}, peak RSS {level['peak_rss_mb']} MB")
+    print(f"  {'stage':<10}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for stage, p in level['latency_seconds'].items():
+        print(f"  {stage:<10}{p['p50']:>9.3f}s{p['p95']:>9.3f}s{p['p99']:>9.3f}s")
+
+def main():
+    args = parse_args()
+
+    # Keep the load test's stores away from the app's data/ directory
+    workdir = tempfile.mkdtemp(prefix='loadtest-')
+    os.environ.setdefault('ATTRACTION_STORE_PATH', os.path.join(workdir, 'attractions.db'))
+    os.environ.setdefault('PLAN_STORE_PATH', os.path.join(workdir, 'plans.db'))
+    os.environ.setdefault('FX_CACHE_PATH', os.path.join(workdir, 'fx_rates.json'))
+    os.environ.setdefault('METRICS_EXPORT_PATH', os.path.join(workdir, 'metrics.prom'))
+    if args.providers == 'replay':
+        os.environ['CASSETTE_MODE'] = 'replay'
+    logging.disable(logging.WARNING)
+    warnings.filterwarnings('ignore')
+
+    if args.providers == 'replay':
+        apis = {'gemini': None, 'amadeus': None, 'weather_key': None}
+    else:
+        apis = StandInProviders(args.latency, args.error_rate, args.seed).apis()
+
+    # Serve FX rates from a local file so no call leaves the machine
+    from ledger import FALLBACK_FX_RATES
+    if not os.path.exists(os.environ['FX_CACHE_PATH']):
+        with open(os.environ['FX_CACHE_PATH'], 'w') as f:
+            json.dump({'rates': FALLBACK_FX_RATES, 'fetched_at': time.time()}, f)
+
+    levels = []
+    for users in [int(n) for n in args.levels.split(',')]:
+        level = run_level(users, args, apis)
+        print_level(level)
+        levels.append(level)
+
+    report = {
+        'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'config': vars(args),
+        'levels': levels
+    }
+    with open(args.report, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nReport written to {args.report}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+'''Per-plan memory footprint: legacy result with raw provider payloads vs compact result.
+
+Run from the repository root:  python benchmarks/plan_memory.py
+'''
+import os
+import sys
+import json
+import logging
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+logging.disable(logging.WARNING)
+
+from agent import TravelAgent
+
+USER_INPUT = {
+    'destination': 'Paris', 'origin': 'London',
+    'start_date': '2025-06-01', 'end_date': '2025-06-08',
+    'budget': 3000, 'interests': ['Culture & Art', 'Food & Gastronomy'],
+    'travel_style': 'mid-range', 'pace': 'moderate'
+}
+APIS = {'gemini': None, 'amadeus': None, 'weather_key': None}
+
+def amadeus_flight(i):
+    '''Flight offer shaped like an Amadeus Flight Offers Search result'''
+    segments = [{
+        'departure': {'iataCode': 'LHR', 'terminal': '5', 'at': f'2025-06-01T{8 + s}:00:00'},
+        'arrival': {'iataCode': 'CDG', 'terminal': '2E', 'at': f'2025-06-01T{10 + s}:15:00'},
+        'carrierCode': 'AF', 'number': f'{1000 + i * 10 + s}', 'aircraft': {'code': '320'},
+        'operating': {'carrierCode': 'AF'}, 'duration': 'PT1H15M', 'id': str(s),
+        'numberOfStops': 0, 'blacklistedInEU': False
+    } for s in range(4)]
+    return {
+        'type': 'flight-offer', 'id': str(i), 'source': 'GDS', 'instantTicketingRequired': False,
+        'nonHomogeneous': False, 'oneWay': False, 'lastTicketingDate': '2025-05-20',
+        'numberOfBookableSeats': 9,
+        'itineraries': [{'duration': 'PT4H30M', 'segments': segments} for _ in range(2)],
+        'price': {'currency': 'EUR', 'total': str(350 + i * 40), 'base': str(300 + i * 40),
+                  'fees': [{'amount': '0.00', 'type': t} for t in ('SUPPLIER', 'TICKETING', 'FORM_OF_PAYMENT')],
+                  'grandTotal': str(350 + i * 40),
+                  'additionalServices': [{'amount': '45.00', 'type': 'CHECKED_BAGS'}]},
+        'pricingOptions': {'fareType': ['PUBLISHED'], 'includedCheckedBagsOnly': True},
+        'validatingAirlineCodes': ['AF'],
+        'travelerPricings': [{
+            'travelerId': str(t), 'fareOption': 'STANDARD', 'travelerType': 'ADULT',
+            'price': {'currency': 'EUR', 'total': str(350 + i * 40), 'base': str(300 + i * 40)},
+            'fareDetailsBySegment': [{
+                'segmentId': str(s), 'cabin': 'ECONOMY', 'fareBasis': 'GL50BALG', 'brandedFare': 'LIGHT',
+                'class': 'G', 'includedCheckedBags': {'quantity': 0},
+                'amenities': [{'description': d, 'isChargeable': True, 'amenityType': 'BAGGAGE',
+                               'amenityProvider': {'name': 'BrandedFare'}}
+                              for d in ('CHECKED BAG 1PC', 'SNACK', 'BEVERAGE', 'SEAT SELECTION', 'CHANGEABLE TICKET')]
+            } for s in range(8)]
+        } for t in range(2)]
+    }
+
+def amadeus_hotel(i):
+    '''Hotel offer shaped like an Amadeus Hotel Search result'''
+    return {
+        'type': 'hotel-offers', 'available': True,
+        'hotel': {'type': 'hotel', 'hotelId': f'HLPAR{i:03d}', 'chainCode': 'HL', 'dupeId': '700000000',
+                  'name': f'Hotel {i} Paris', 'rating': str(3 + i % 3), 'cityCode': 'PAR',
+                  'latitude': 48.85, 'longitude': 2.35,
+                  'description': {'lang': 'EN', 'text': 'A charming hotel in the heart of Paris. ' * 20}},
+        'offers': [{
+            'id': f'OFFER{i}{o}', 'checkInDate': '2025-06-01', 'checkOutDate': '2025-06-08', 'rateCode': 'RAC',
+            'room': {'type': 'A1K', 'typeEstimated': {'category': 'STANDARD_ROOM', 'beds': 1, 'bedType': 'KING'},
+                     'description': {'text': 'Standard room, king bed, city view. ' * 8, 'lang': 'EN'}},
+            'guests': {'adults': 1},
+            'price': {'currency': 'EUR', 'base': str(120 + i * 30), 'total': str((120 + i * 30) * 7),
+                      'variations': {'changes': [{'startDate': f'2025-06-0{d + 1}', 'endDate': f'2025-06-0{d + 2}',
+                                                  'base': str(120 + i * 30)} for d in range(7)]}},
+            'policies': {'paymentType': 'guarantee',
+                         'cancellation': {'description': {'text': 'Free cancellation until 48h before arrival. ' * 5}}}
+        } for o in range(6)],
+        'amenities': ['WIFI', 'RESTAURANT', 'BAR', 'GYM', 'SPA', 'PARKING', 'ROOM_SERVICE']
+    }
+
+def openweather_forecast():
+    '''5-day / 3-hour forecast shaped like the OpenWeather response'''
+    start = datetime(2025, 6, 1)
+    return {
+        'cod': '200', 'message': 0, 'cnt': 40,
+        'list': [{
+            'dt': int((start + timedelta(hours=3 * n)).timestamp()),
+            'main': {'temp': 18 + n % 8, 'feels_like': 17 + n % 8, 'temp_min': 15.0, 'temp_max': 24.0,
+                     'pressure': 1013, 'sea_level': 1013, 'grnd_level': 1005, 'humidity': 60 + n % 20, 'temp_kf': 0},
+            'weather': [{'id': 800, 'main': 'Clear', 'description': 'clear sky', 'icon': '01d'}],
+            'clouds': {'all': 0}, 'wind': {'speed': 3.5, 'deg': 220, 'gust': 5.1}, 'visibility': 10000,
+            'pop': 0, 'sys': {'pod': 'd'},
+            'dt_txt': (start + timedelta(hours=3 * n)).strftime('%Y-%m-%d %H:%M:%S')
+        } for n in range(40)],
+        'city': {'id': 2988507, 'name': 'Paris', 'coord': {'lat': 48.8534, 'lon': 2.3488}, 'country': 'FR',
+                 'population': 2138551, 'timezone': 7200, 'sunrise': 1748749000, 'sunset': 1748806000}
+    }
+
+def deep_sizeof(obj, seen=None):
+    '''Approximate retained size of a nested dict/list structure in bytes'''
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(deep_sizeof(v, seen) for v in obj)
+    return size
+
+def export_cost(result):
+    '''Bytes of the JSON export and peak memory while producing it'''
+    tracemalloc.start()
+    data = json.dumps(result, indent=2, default=str)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(data.encode('utf-8')), peak
+
+def build_plan():
+    agent = TravelAgent(USER_INPUT, APIS)
+    agent.perceive()
+    agent.perceived_data['flights'] = [amadeus_flight(i) for i in range(5)]
+    agent.perceived_data['hotels'] = [amadeus_hotel(i) for i in range(5)]
+    agent.perceived_data['weather'] = openweather_forecast()
+    agent.reason()
+    agent.plan()
+    return agent, agent.act()
+
+def legacy_result(agent, result):
+    '''The result shape before compaction, embedding the raw provider payloads'''
+    legacy = {k: v for k, v in result.items() if k not in ('alt_flights', 'alt_hotels', 'weather', 'raw_refs')}
+    legacy.update({
+        'flight': agent.reasoning_output['selected_flight'],
+        'hotel': agent.reasoning_output['selected_hotel'],
+        'all_flights': agent.perceived_data['flights'][:5],
+        'all_hotels': agent.perceived_data['hotels'][:5],
+        'weather_summary': agent.perceived_data['weather']
+    })
+    return legacy
+
+def main():
+    agent, compact = build_plan()
+    legacy = legacy_result(agent, compact)
+
+    print(f"{'':<10}{'in-memory':>14}{'JSON export':>14}{'export peak':>14}")
+    for label, result in (('legacy', legacy), ('compact', compact)):
+        json_bytes, peak = export_cost(result)
+        print(f"{label:<10}{deep_sizeof(result) / 1024:>11.1f} KB{json_bytes / 1024:>11.1f} KB{peak / 1024:>11.1f} KB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from config import RESPONSE_CACHE_TTL_SECONDS, RESPONSE_CACHE_MAX_ENTRIES
+
+def cache_key(namespace, *parts):
+    '''Build a stable string key like "amadeus.flights:LON:PAR:2025-01-01"'''
+    return ':'.join([namespace] + [str(p) for p in parts])
+
+class ResponseCache:
+    '''Thread-safe TTL/LRU cache of raw provider responses.
+
+    fetch() joins an in-flight fetch for the same key instead of starting a
+    second one, so a background prefetch and the agent share one request.
+    A hedged duplicate passes join=False to send its own request instead.
+    Empty results and exceptions are never cached.
+    '''
+
+    def __init__(self, ttl=RESPONSE_CACHE_TTL_SECONDS, max_entries=RESPONSE_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def peek(self, key):
+        '''Return a fresh cached value or None'''
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        if not value:
+            return value
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def fetch(self, key, fn, timeout=None, join=True):
+        '''Return the cached value, wait for an in-flight fetch, or call fn()'''
+        value = self.peek(key)
+        if value is not None:
+            return value
+        
+        if not join:
+            self.misses += 1
+            return self.put(key, fn())
+
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+
+        if not owner:
+            self.hits += 1
+            return future.result(timeout)
+
+        self.misses += 1
+        try:
+            value = self.put(key, fn())
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def export(self, keys):
+        '''Fresh cached values for the given keys, e.g. to seed a worker process'''
+        entries = {}
+        for key in keys:
+            value = self.peek(key)
+            if value is not None:
+                entries[key] = value
+        return entries
+
+    def seed(self, entries):
+        for key, value in entries.items():
+            self.put(key, value)
+
+    def is_pending(self, key):
+        with self._lock:
+            return key in self._inflight
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+response_cache = ResponseCache()
@@ -0,0 +1,62 @@
+import os
+import gzip
+import json
+import time
+import hashlib
+from config import CASSETTE_MODE, CASSETTE_DIR, CASSETTE_LATENCY_SCALE
+
+class CassetteMiss(Exception):
+    '''No recorded response for a request in replay mode'''
+
+def replaying():
+    return CASSETTE_MODE == 'replay'
+
+def cassette_path(provider, key, directory=CASSETTE_DIR):
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:20]
+    return os.path.join(directory, provider, f'{digest}.json.gz')
+
+def load(provider, key, directory=CASSETTE_DIR):
+    path = cassette_path(provider, key, directory)
+    if not os.path.exists(path):
+        return None
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return json.load(f)
+
+def save(provider, key, response, latency, directory=CASSETTE_DIR):
+    path = cassette_path(provider, key, directory)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+        json.dump({
+            'provider': provider,
+            'key': key,
+            'latency': latency,
+            'recorded_at': time.time(),
+            'response': response
+        }, f)
+    os.replace(tmp_path, path)
+
+def play(provider, key, fn, mode=None, directory=CASSETTE_DIR, latency_scale=CASSETTE_LATENCY_SCALE):
+    '''Call fn() through the cassette layer.
+
+    off:    call fn() directly
+    record: call fn() and store its JSON-serializable result with its latency
+    replay: return the stored result after its recorded latency times
+            latency_scale, without calling fn(); raise CassetteMiss if absent
+    '''
+    mode = mode or CASSETTE_MODE
+    if mode == 'replay':
+        cassette = load(provider, key, directory)
+        if cassette is None:
+            raise CassetteMiss(f"No {provider} cassette for {key}")
+        if latency_scale > 0:
+            time.sleep(cassette['latency'] * latency_scale)
+        return cassette['response']
+
+    if mode == 'record':
+        start = time.monotonic()
+        response = fn()
+        save(provider, key, response, time.monotonic() - start, directory)
+        return response
+
+    return fn()
@@ -0,0 +1,126 @@
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+import metrics
+from config import (
+    CIRCUIT_WINDOW_SIZE, CIRCUIT_MIN_CALLS, CIRCUIT_ERROR_RATE,
+    CIRCUIT_SLOW_CALL_SECONDS, CIRCUIT_OPEN_SECONDS
+)
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half-open'
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+metrics.describe('provider_calls_total', 'External provider calls by outcome')
+metrics.describe('provider_latency_seconds', 'External provider call latency')
+metrics.describe('provider_circuit_state', 'Circuit state: 0 closed, 1 half-open, 2 open')
+metrics.describe('provider_short_circuits_total', 'Calls skipped because the circuit was open')
+
+class CircuitBreaker:
+    '''Closed/open/half-open breaker over a rolling window of recent calls.
+
+    Errors and calls slower than `slow_call_seconds` both count as failures.
+    When the failure rate over the window reaches `error_rate` the circuit opens
+    and calls go straight to the fallback; after `open_seconds` a single probe
+    call is let through to decide whether to close again.
+    '''
+
+    def __init__(self, name, window_size=CIRCUIT_WINDOW_SIZE, min_calls=CIRCUIT_MIN_CALLS,
+                 error_rate=CIRCUIT_ERROR_RATE, slow_call_seconds=CIRCUIT_SLOW_CALL_SECONDS,
+                 open_seconds=CIRCUIT_OPEN_SECONDS):
+        self.name = name
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.calls = deque(maxlen=window_size)
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self._lock = threading.Lock()
+        self._export_state()
+
+    def allow(self):
+        '''Return True if a call may be attempted now'''
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.open_seconds:
+                self._transition(HALF_OPEN)
+            if self.state == HALF_OPEN and not self.probe_in_flight:
+                self.probe_in_flight = True
+                return True
+            allowed = self.state == CLOSED
+        if not allowed:
+            metrics.inc('provider_short_circuits_total', {'provider': self.name})
+        return allowed
+
+    def record(self, ok, latency):
+        failed = not ok or latency > self.slow_call_seconds
+        metrics.inc('provider_calls_total', {'provider': self.name, 'outcome': 'failure' if failed else 'success'})
+        metrics.observe('provider_latency_seconds', {'provider': self.name}, latency)
+
+        with self._lock:
+            self.calls.append((failed, latency))
+            if self.state == HALF_OPEN:
+                self.probe_in_flight = False
+                self._transition(OPEN if failed else CLOSED)
+            elif self.state == CLOSED and len(self.calls) >= self.min_calls:
+                if sum(f for f, _ in self.calls) / len(self.calls) >= self.error_rate:
+                    self._transition(OPEN)
+
+    @contextmanager
+    def track(self, ignore=()):
+        '''Time the wrapped call and record its outcome; exceptions are re-raised.
+
+        Exceptions of the `ignore` types say nothing about the provider's health and
+        are not recorded; they only free a half-open probe slot.
+        '''
+        start = time.monotonic()
+        try:
+            yield
+        except ignore:
+            with self._lock:
+                self.probe_in_flight = False
+            raise
+        except Exception:
+            self.record(False, time.monotonic() - start)
+            raise
+        self.record(True, time.monotonic() - start)
+
+    def health(self):
+        with self._lock:
+            calls = list(self.calls)
+            state = self.state
+        latencies = sorted(latency for _, latency in calls)
+        return {
+            'provider': self.name,
+            'state': state,
+            'calls': len(calls),
+            'error_rate': sum(f for f, _ in calls) / len(calls) if calls else 0.0,
+            'p95_latency': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else None
+        }
+
+    def _transition(self, state):
+        self.state = state
+        if state == OPEN:
+            self.opened_at = time.monotonic()
+        elif state == CLOSED:
+            self.calls.clear()
+        self._export_state()
+
+    def _export_state(self):
+        metrics.set_gauge('provider_circuit_state', {'provider': self.name}, STATE_VALUES[self.state])
+
+_BREAKERS = {}
+_REGISTRY_LOCK = threading.Lock()
+
+def get_breaker(name):
+    '''Return the process-wide breaker for a provider, creating it on first use'''
+    with _REGISTRY_LOCK:
+        if name not in _BREAKERS:
+            _BREAKERS[name] = CircuitBreaker(name)
+        return _BREAKERS[name]
+
+def all_health():
+    with _REGISTRY_LOCK:
+        breakers = list(_BREAKERS.values())
+    return [b.health() for b in breakers]
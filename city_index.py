@@ -0,0 +1,302 @@
+import unicodedata
+from collections import namedtuple
+
+City = namedtuple('City', 'id name region country lat lon population aliases')
+
+# Bundled cities: (IATA city code, name, region, country, lat, lon, metro population in millions, aliases).
+# The IATA code is the canonical city ID passed to providers.
+CITIES = [City(*row) for row in [
+    # Europe
+    ('PAR', 'Paris', '', 'France', 48.8566, 2.3522, 11.0, ()),
+    ('LON', 'London', '', 'United Kingdom', 51.5074, -0.1278, 9.5, ()),
+    ('ROM', 'Rome', '', 'Italy', 41.9028, 12.4964, 4.3, ('roma',)),
+    ('MIL', 'Milan', '', 'Italy', 45.4642, 9.1900, 3.1, ('milano',)),
+    ('VCE', 'Venice', '', 'Italy', 45.4408, 12.3155, 0.3, ('venezia',)),
+    ('FLR', 'Florence', '', 'Italy', 43.7696, 11.2558, 0.7, ('firenze',)),
+    ('NAP', 'Naples', '', 'Italy', 40.8518, 14.2681, 2.2, ('napoli',)),
+    ('BCN', 'Barcelona', '', 'Spain', 41.3874, 2.1686, 5.6, ()),
+    ('MAD', 'Madrid', '', 'Spain', 40.4168, -3.7038, 6.7, ()),
+    ('SVQ', 'Seville', '', 'Spain', 37.3891, -5.9845, 1.5, ('sevilla',)),
+    ('VLC', 'Valencia', '', 'Spain', 39.4699, -0.3763, 1.6, ()),
+    ('LIS', 'Lisbon', '', 'Portugal', 38.7223, -9.1393, 2.9, ('lisboa',)),
+    ('OPO', 'Porto', '', 'Portugal', 41.1579, -8.6291, 1.3, ('oporto',)),
+    ('BER', 'Berlin', '', 'Germany', 52.5200, 13.4050, 3.6, ()),
+    ('MUC', 'Munich', '', 'Germany', 48.1351, 11.5820, 1.5, ('munchen',)),
+    ('FRA', 'Frankfurt', '', 'Germany', 50.1109, 8.6821, 0.8, ()),
+    ('HAM', 'Hamburg', '', 'Germany', 53.5511, 9.9937, 1.8, ()),
+    ('AMS', 'Amsterdam', '', 'Netherlands', 52.3676, 4.9041, 1.2, ()),
+    ('BRU', 'Brussels', '', 'Belgium', 50.8503, 4.3517, 2.1, ('bruxelles',)),
+    ('VIE', 'Vienna', '', 'Austria', 48.2082, 16.3738, 1.9, ('wien',)),
+    ('PRG', 'Prague', '', 'Czechia', 50.0755, 14.4378, 1.3, ('praha',)),
+    ('BUD', 'Budapest', '', 'Hungary', 47.4979, 19.0402, 1.8, ()),
+    ('WAW', 'Warsaw', '', 'Poland', 52.2297, 21.0122, 1.8, ('warszawa',)),
+    ('KRK', 'Krakow', '', 'Poland', 50.0647, 19.9450, 0.8, ('cracow',)),
+    ('ZRH', 'Zurich', '', 'Switzerland', 47.3769, 8.5417, 1.4, ()),
+    ('GVA', 'Geneva', '', 'Switzerland', 46.2044, 6.1432, 0.6, ('geneve',)),
+    ('CPH', 'Copenhagen', '', 'Denmark', 55.6761, 12.5683, 1.3, ('kobenhavn',)),
+    ('STO', 'Stockholm', '', 'Sweden', 59.3293, 18.0686, 1.6, ()),
+    ('OSL', 'Oslo', '', 'Norway', 59.9139, 10.7522, 1.0, ()),
+    ('HEL', 'Helsinki', '', 'Finland', 60.1699, 24.9384, 1.3, ()),
+    ('REK', 'Reykjavik', '', 'Iceland', 64.1466, -21.9426, 0.2, ()),
+    ('DUB', 'Dublin', '', 'Ireland', 53.3498, -6.2603, 1.4, ()),
+    ('EDI', 'Edinburgh', '', 'United Kingdom', 55.9533, -3.1883, 0.5, ()),
+    ('MAN', 'Manchester', '', 'United Kingdom', 53.4808, -2.2426, 2.8, ()),
+    ('NCE', 'Nice', '', 'France', 43.7102, 7.2620, 1.0, ()),
+    ('LYS', 'Lyon', '', 'France', 45.7640, 4.8357, 2.3, ()),
+    ('MRS', 'Marseille', '', 'France', 43.2965, 5.3698, 1.8, ()),
+    ('ATH', 'Athens', '', 'Greece', 37.9838, 23.7275, 3.2, ('athina',)),
+    ('SPU', 'Split', '', 'Croatia', 43.5081, 16.4402, 0.2, ()),
+    ('DBV', 'Dubrovnik', '', 'Croatia', 42.6507, 18.0944, 0.04, ()),
+    ('IST', 'Istanbul', '', 'Turkey', 41.0082, 28.9784, 15.5, ()),
+    ('MOW', 'Moscow', '', 'Russia', 55.7558, 37.6173, 12.5, ()),
+    ('LED', 'Saint Petersburg', '', 'Russia', 59.9343, 30.3351, 5.4, ('st petersburg',)),
+    # Asia & Middle East
+    ('TYO', 'Tokyo', '', 'Japan', 35.6762, 139.6503, 37.4, ()),
+    ('OSA', 'Osaka', '', 'Japan', 34.6937, 135.5023, 19.1, ()),
+    ('UKY', 'Kyoto', '', 'Japan', 35.0116, 135.7681, 1.5, ()),
+    ('SEL', 'Seoul', '', 'South Korea', 37.5665, 126.9780, 9.9, ()),
+    ('BJS', 'Beijing', '', 'China', 39.9042, 116.4074, 21.5, ('peking',)),
+    ('SHA', 'Shanghai', '', 'China', 31.2304, 121.4737, 24.9, ()),
+    ('HKG', 'Hong Kong', '', 'China', 22.3193, 114.1694, 7.5, ()),
+    ('TPE', 'Taipei', '', 'Taiwan', 25.0330, 121.5654, 7.0, ()),
+    ('SIN', 'Singapore', '', 'Singapore', 1.3521, 103.8198, 5.7, ()),
+    ('BKK', 'Bangkok', '', 'Thailand', 13.7563, 100.5018, 10.7, ()),
+    ('HKT', 'Phuket', '', 'Thailand', 7.8804, 98.3923, 0.4, ()),
+    ('CNX', 'Chiang Mai', '', 'Thailand', 18.7883, 98.9853, 1.2, ()),
+    ('KUL', 'Kuala Lumpur', '', 'Malaysia', 3.1390, 101.6869, 8.4, ('kl',)),
+    ('JKT', 'Jakarta', '', 'Indonesia', -6.2088, 106.8456, 10.6, ()),
+    ('DPS', 'Denpasar', 'Bali', 'Indonesia', -8.6705, 115.2126, 0.9, ('bali',)),
+    ('MNL', 'Manila', '', 'Philippines', 14.5995, 120.9842, 13.9, ()),
+    ('SGN', 'Ho Chi Minh City', '', 'Vietnam', 10.8231, 106.6297, 9.0, ('saigon',)),
+    ('HAN', 'Hanoi', '', 'Vietnam', 21.0278, 105.8342, 8.0, ()),
+    ('BOM', 'Mumbai', '', 'India', 19.0760, 72.8777, 20.7, ('bombay',)),
+    ('DEL', 'Delhi', '', 'India', 28.7041, 77.1025, 32.9, ('new delhi',)),
+    ('BLR', 'Bengaluru', '', 'India', 12.9716, 77.5946, 13.2, ('bangalore',)),
+    ('MAA', 'Chennai', '', 'India', 13.0827, 80.2707, 11.5, ('madras',)),
+    ('CCU', 'Kolkata', '', 'India', 22.5726, 88.3639, 15.1, ('calcutta',)),
+    ('HYD', 'Hyderabad', '', 'India', 17.3850, 78.4867, 10.5, ()),
+    ('GOI', 'Goa', '', 'India', 15.2993, 74.1240, 1.5, ()),
+    ('JAI', 'Jaipur', '', 'India', 26.9124, 75.7873, 4.1, ()),
+    ('KTM', 'Kathmandu', '', 'Nepal', 27.7172, 85.3240, 1.5, ()),
+    ('CMB', 'Colombo', '', 'Sri Lanka', 6.9271, 79.8612, 0.8, ()),
+    ('MLE', 'Male', '', 'Maldives', 4.1755, 73.5093, 0.2, ('maldives',)),
+    ('KHI', 'Karachi', '', 'Pakistan', 24.8607, 67.0011, 16.8, ()),
+    ('DXB', 'Dubai', '', 'United Arab Emirates', 25.2048, 55.2708, 3.5, ()),
+    ('AUH', 'Abu Dhabi', '', 'United Arab Emirates', 24.4539, 54.3773, 1.5, ()),
+    ('DOH', 'Doha', '', 'Qatar', 25.2854, 51.5310, 2.4, ()),
+    ('RUH', 'Riyadh', '', 'Saudi Arabia', 24.7136, 46.6753, 7.5, ()),
+    ('TLV', 'Tel Aviv', '', 'Israel', 32.0853, 34.7818, 4.2, ()),
+    ('AMM', 'Amman', '', 'Jordan', 31.9454, 35.9284, 4.0, ()),
+    # Africa
+    ('CAI', 'Cairo', '', 'Egypt', 30.0444, 31.2357, 21.3, ()),
+    ('RAK', 'Marrakech', '', 'Morocco', 31.6295, -7.9811, 1.0, ('marrakesh',)),
+    ('CAS', 'Casablanca', '', 'Morocco', 33.5731, -7.5898, 3.8, ()),
+    ('CPT', 'Cape Town', '', 'South Africa', -33.9249, 18.4241, 4.8, ()),
+    ('JNB', 'Johannesburg', '', 'South Africa', -26.2041, 28.0473, 6.1, ('joburg',)),
+    ('NBO', 'Nairobi', '', 'Kenya', -1.2921, 36.8219, 5.1, ()),
+    ('ZNZ', 'Zanzibar', '', 'Tanzania', -6.1659, 39.2026, 0.7, ()),
+    ('LOS', 'Lagos', '', 'Nigeria', 6.5244, 3.3792, 15.4, ()),
+    # North America
+    ('NYC', 'New York', 'New York', 'United States', 40.7128, -74.0060, 18.8, ('nyc', 'new york city')),
+    ('LAX', 'Los Angeles', 'California', 'United States', 34.0522, -118.2437, 12.5, ('la',)),
+    ('CHI', 'Chicago', 'Illinois', 'United States', 41.8781, -87.6298, 8.9, ()),
+    ('SFO', 'San Francisco', 'California', 'United States', 37.7749, -122.4194, 3.3, ('sf',)),
+    ('SJC', 'San Jose', 'California', 'United States', 37.3382, -121.8863, 2.0, ()),
+    ('SAN', 'San Diego', 'California', 'United States', 32.7157, -117.1611, 3.3, ()),
+    ('WAS', 'Washington', 'District of Columbia', 'United States', 38.9072, -77.0369, 5.4, ('washington dc', 'dc')),
+    ('BOS', 'Boston', 'Massachusetts', 'United States', 42.3601, -71.0589, 4.3, ()),
+    ('PHL', 'Philadelphia', 'Pennsylvania', 'United States', 39.9526, -75.1652, 6.2, ()),
+    ('MIA', 'Miami', 'Florida', 'United States', 25.7617, -80.1918, 6.1, ()),
+    ('MCO', 'Orlando', 'Florida', 'United States', 28.5383, -81.3792, 1.7, ()),
+    ('MLB', 'Melbourne', 'Florida', 'United States', 28.0836, -80.6081, 0.1, ()),
+    ('ATL', 'Atlanta', 'Georgia', 'United States', 33.7490, -84.3880, 5.1, ()),
+    ('BNA', 'Nashville', 'Tennessee', 'United States', 36.1627, -86.7816, 2.0, ()),
+    ('MSY', 'New Orleans', 'Louisiana', 'United States', 29.9511, -90.0715, 1.3, ()),
+    ('DFW', 'Dallas', 'Texas', 'United States', 32.7767, -96.7970, 6.5, ()),
+    ('HOU', 'Houston', 'Texas', 'United States', 29.7604, -95.3698, 7.1, ()),
+    ('PRX', 'Paris', 'Texas', 'United States', 33.6609, -95.5555, 0.03, ()),
+    ('DEN', 'Denver', 'Colorado', 'United States', 39.7392, -104.9903, 2.9, ()),
+    ('PHX', 'Phoenix', 'Arizona', 'United States', 33.4484, -112.0740, 4.9, ()),
+    ('LAS', 'Las Vegas', 'Nevada', 'United States', 36.1699, -115.1398, 2.2, ('vegas',)),
+    ('SEA', 'Seattle', 'Washington', 'United States', 47.6062, -122.3321, 3.4, ()),
+    ('PDX', 'Portland', 'Oregon', 'United States', 45.5152, -122.6784, 2.5, ()),
+    ('PWM', 'Portland', 'Maine', 'United States', 43.6591, -70.2568, 0.5, ()),
+    ('HNL', 'Honolulu', 'Hawaii', 'United States', 21.3069, -157.8583, 1.0, ()),
+    ('YTO', 'Toronto', 'Ontario', 'Canada', 43.6532, -79.3832, 6.4, ()),
+    ('YXU', 'London', 'Ontario', 'Canada', 42.9849, -81.2453, 0.5, ()),
+    ('YMQ', 'Montreal', 'Quebec', 'Canada', 45.5017, -73.5673, 4.3, ()),
+    ('YVR', 'Vancouver', 'British Columbia', 'Canada', 49.2827, -123.1207, 2.6, ()),
+    ('MEX', 'Mexico City', '', 'Mexico', 19.4326, -99.1332, 21.8, ('cdmx',)),
+    ('CUN', 'Cancun', '', 'Mexico', 21.1619, -86.8515, 0.9, ()),
+    ('HAV', 'Havana', '', 'Cuba', 23.1136, -82.3666, 2.1, ('la habana',)),
+    ('SJU', 'San Juan', '', 'Puerto Rico', 18.4655, -66.1057, 2.4, ()),
+    ('PTY', 'Panama City', '', 'Panama', 8.9824, -79.5199, 1.9, ()),
+    ('SJO', 'San Jose', '', 'Costa Rica', 9.9281, -84.0907, 1.4, ()),
+    # South America
+    ('BOG', 'Bogota', '', 'Colombia', 4.7110, -74.0721, 11.3, ()),
+    ('CTG', 'Cartagena', '', 'Colombia', 10.3910, -75.4794, 1.0, ()),
+    ('UIO', 'Quito', '', 'Ecuador', -0.1807, -78.4678, 1.9, ()),
+    ('LIM', 'Lima', '', 'Peru', -12.0464, -77.0428, 11.0, ()),
+    ('CUZ', 'Cusco', '', 'Peru', -13.5319, -71.9675, 0.4, ('cuzco',)),
+    ('SCL', 'Santiago', '', 'Chile', -33.4489, -70.6693, 6.9, ()),
+    ('BUE', 'Buenos Aires', '', 'Argentina', -34.6037, -58.3816, 15.4, ()),
+    ('RIO', 'Rio de Janeiro', '', 'Brazil', -22.9068, -43.1729, 13.6, ('rio',)),
+    ('SAO', 'Sao Paulo', '', 'Brazil', -23.5505, -46.6333, 22.6, ()),
+    # Oceania
+    ('SYD', 'Sydney', 'New South Wales', 'Australia', -33.8688, 151.2093, 5.3, ()),
+    ('MEL', 'Melbourne', 'Victoria', 'Australia', -37.8136, 144.9631, 5.1, ()),
+    ('BNE', 'Brisbane', 'Queensland', 'Australia', -27.4698, 153.0251, 2.6, ()),
+    ('PER', 'Perth', 'Western Australia', 'Australia', -31.9505, 115.8605, 2.1, ()),
+    ('AKL', 'Auckland', '', 'New Zealand', -36.8485, 174.7633, 1.7, ()),
+    ('WLG', 'Wellington', '', 'New Zealand', -41.2865, 174.7762, 0.4, ()),
+    ('ZQN', 'Queenstown', '', 'New Zealand', -45.0312, 168.6626, 0.05, ()),
+]]
+
+def normalize(text):
+    '''Lowercase, strip accents and punctuation, collapse whitespace'''
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(c if c.isalnum() else ' ' for c in text if not unicodedata.combining(c))
+    return ' '.join(text.lower().split())
+
+def city_label(city):
+    '''Display name, e.g. "Portland, Oregon, United States (PDX)"'''
+    parts = [city.name, city.region, city.country]
+    return f"{', '.join(p for p in parts if p)} ({city.id})"
+
+class _Node:
+    __slots__ = ('children', 'cities', 'top')
+
+    def __init__(self):
+        self.children = {}
+        self.cities = []
+        self.top = ()
+
+class CityIndex:
+    '''Trie over city names, aliases and IATA codes with bounded edit-distance search.
+
+    Every node keeps the most populous cities in its subtree, so prefix
+    lookups are a walk down the trie with no subtree scan.
+    '''
+
+    def __init__(self, cities, top_k=8):
+        self.cities = list(cities)
+        self.by_id = {city.id: i for i, city in enumerate(self.cities)}
+        self.top_k = top_k
+        self.root = _Node()
+        for i, city in enumerate(self.cities):
+            for key in {normalize(city.name), city.id.lower(), *(normalize(a) for a in city.aliases)}:
+                self._insert(key, i)
+        self._collect_top(self.root)
+
+    def _insert(self, key, city_index):
+        node = self.root
+        for ch in key:
+            node = node.children.setdefault(ch, _Node())
+        if city_index not in node.cities:
+            node.cities.append(city_index)
+
+    def _rank(self, indexes):
+        return sorted(set(indexes), key=lambda i: -self.cities[i].population)
+
+    def _collect_top(self, node):
+        indexes = list(node.cities)
+        for child in node.children.values():
+            indexes.extend(self._collect_top(child))
+        node.top = tuple(self._rank(indexes)[:self.top_k])
+        return node.top
+
+    def _find(self, key):
+        node = self.root
+        for ch in key:
+            node = node.children.get(ch)
+            if node is None:
+                return None
+        return node
+
+    def _split(self, text):
+        '''"Portland, Maine" -> ("portland", "maine"): name plus an optional region/country filter'''
+        name, _, qualifier = (text or '').partition(',')
+        return normalize(name), normalize(qualifier)
+
+    def _qualified(self, indexes, qualifier):
+        if not qualifier:
+            return list(indexes)
+        return [i for i in indexes
+                if qualifier in normalize(self.cities[i].region) or qualifier in normalize(self.cities[i].country)
+                or qualifier == self.cities[i].id.lower()]
+
+    def get(self, city_id):
+        i = self.by_id.get((city_id or '').upper())
+        return self.cities[i] if i is not None else None
+
+    def lookup(self, text):
+        '''Cities whose name, alias or code matches exactly, most populous first'''
+        if text and text.strip().endswith(')') and '(' in text:
+            # A label picked from suggestions: "Paris, France (PAR)"
+            city = self.get(text.rsplit('(', 1)[1].rstrip(') '))
+            if city:
+                return [city]
+        name, qualifier = self._split(text)
+        node = self._find(name) if name else None
+        if node is None:
+            return []
+        return [self.cities[i] for i in self._qualified(self._rank(node.cities), qualifier)]
+
+    def fuzzy(self, text, max_distance=None):
+        '''(city, distance) pairs within a bounded edit distance of the name.
+
+        Distance counts insertions, deletions, substitutions and adjacent
+        transpositions. The first letter must match, which keeps the search
+        to one subtree and matches how people mistype city names.
+        '''
+        name, qualifier = self._split(text)
+        start = self.root.children.get(name[:1])
+        if start is None:
+            return []
+        if max_distance is None:
+            max_distance = 0 if len(name) <= 3 else 1 if len(name) <= 5 else 2
+
+        found = {}
+        size = len(name)
+
+        def step(row, previous, ch, next_ch):
+            next_row = [row[0] + 1]
+            for i in range(1, size + 1):
+                cost = min(next_row[i - 1] + 1, row[i] + 1, row[i - 1] + (name[i - 1] != next_ch))
+                if i > 1 and name[i - 1] == ch and name[i - 2] == next_ch:
+                    cost = min(cost, previous[i - 2] + 1)
+                next_row.append(cost)
+            return next_row
+
+        first_row = list(range(size + 1))
+        stack = [(start, name[0], step(first_row, None, '', name[0]), first_row)]
+        while stack:
+            node, ch, row, previous = stack.pop()
+            if row[-1] <= max_distance:
+                for i in node.cities:
+                    found[i] = min(found.get(i, max_distance), row[-1])
+            if min(row) <= max_distance:
+                stack.extend((child, next_ch, step(row, previous, ch, next_ch), row)
+                             for next_ch, child in node.children.items())
+
+        indexes = self._qualified(found, qualifier)
+        ranked = sorted(indexes, key=lambda i: (found[i], -self.cities[i].population))
+        return [(self.cities[i], found[i]) for i in ranked]
+
+    def suggest(self, text, limit=5):
+        '''Autocomplete: exact matches, then prefix matches, then close misspellings'''
+        name, qualifier = self._split(text)
+        if not name:
+            return []
+        node = self._find(name)
+        indexes = self._qualified(node.top, qualifier) if node else []
+        indexes += [self.by_id[city.id] for city, _ in self.fuzzy(text)]
+        exact = [self.by_id[city.id] for city in self.lookup(text)]
+
+        suggestions = []
+        for i in exact + indexes:
+            if i not in suggestions:
+                suggestions.append(i)
+        return [self.cities[i] for i in suggestions[:limit]]
+
+CITY_INDEX = CityIndex(CITIES)
@@ -0,0 +1,113 @@
+import numpy as np
+from city_index import CITY_INDEX
+
+# Monthly normals per city ID: (mean temp °C, mean humidity %, rainy days) for Jan..Dec
+CLIMATE_NORMALS = {
+    'PAR': ([5, 6, 9, 12, 16, 19, 21, 21, 17, 13, 8, 5],
+            [85, 80, 75, 70, 70, 70, 68, 70, 75, 80, 85, 86],
+            [10, 9, 10, 9, 10, 8, 7, 7, 8, 10, 10, 11]),
+    'LON': ([5, 5, 7, 10, 13, 16, 18, 18, 15, 12, 8, 6],
+            [85, 80, 75, 70, 70, 68, 68, 70, 75, 80, 85, 86],
+            [11, 9, 9, 9, 8, 8, 8, 8, 8, 10, 10, 10]),
+    'TYO': ([5, 6, 9, 14, 19, 22, 26, 27, 24, 18, 13, 8],
+            [50, 52, 57, 62, 67, 74, 76, 73, 74, 68, 62, 55],
+            [5, 6, 10, 10, 11, 12, 11, 8, 11, 9, 7, 5]),
+    'NYC': ([0, 2, 6, 12, 17, 22, 25, 24, 21, 14, 9, 3],
+            [62, 60, 58, 57, 63, 66, 67, 69, 69, 66, 64, 64],
+            [10, 9, 11, 11, 11, 10, 10, 9, 8, 9, 9, 10]),
+    'ROM': ([8, 9, 11, 14, 18, 22, 25, 25, 22, 17, 12, 9],
+            [75, 72, 70, 70, 68, 65, 62, 65, 70, 74, 77, 77],
+            [8, 8, 7, 8, 6, 4, 2, 3, 6, 8, 10, 9]),
+    'BCN': ([10, 11, 12, 14, 18, 22, 25, 25, 22, 18, 14, 11],
+            [70, 69, 69, 70, 71, 70, 70, 72, 73, 74, 72, 70],
+            [4, 4, 5, 6, 6, 4, 3, 4, 6, 6, 5, 5]),
+    'DXB': ([19, 20, 23, 27, 31, 33, 35, 35, 33, 29, 25, 21],
+            [65, 65, 63, 55, 53, 58, 57, 59, 62, 62, 62, 65],
+            [2, 2, 2, 1, 0, 0, 0, 0, 0, 0, 1, 2]),
+    'SIN': ([27, 27, 28, 28, 28, 28, 28, 28, 27, 27, 27, 26],
+            [84, 81, 83, 84, 83, 82, 82, 82, 83, 84, 87, 87],
+            [15, 11, 14, 15, 14, 13, 13, 14, 14, 16, 19, 19]),
+    'SYD': ([23, 23, 22, 19, 16, 14, 13, 14, 16, 18, 20, 22],
+            [65, 68, 67, 65, 64, 62, 57, 53, 54, 57, 61, 62],
+            [12, 13, 13, 12, 12, 12, 10, 9, 10, 11, 12, 11]),
+    'BKK': ([27, 28, 30, 30, 30, 29, 29, 29, 28, 28, 27, 26],
+            [67, 70, 71, 72, 75, 74, 75, 76, 79, 78, 72, 66],
+            [2, 3, 5, 7, 16, 17, 18, 20, 21, 16, 6, 2]),
+    'BOM': ([24, 25, 27, 29, 30, 29, 28, 27, 27, 29, 28, 26],
+            [60, 60, 64, 68, 70, 80, 86, 86, 83, 75, 64, 61],
+            [0, 0, 0, 0, 1, 14, 22, 21, 14, 3, 1, 0]),
+    'DEL': ([14, 17, 23, 29, 33, 33, 31, 30, 29, 26, 20, 15],
+            [65, 55, 45, 30, 30, 45, 70, 75, 65, 50, 55, 65],
+            [2, 2, 2, 1, 2, 5, 12, 12, 6, 1, 0, 1]),
+    'IST': ([6, 6, 8, 12, 17, 22, 24, 25, 21, 16, 12, 8],
+            [76, 74, 72, 71, 72, 70, 69, 70, 70, 74, 75, 76],
+            [13, 11, 10, 7, 5, 4, 2, 3, 5, 8, 10, 13]),
+    'LAX': ([14, 15, 16, 17, 18, 20, 22, 23, 22, 20, 17, 14],
+            [62, 65, 68, 68, 72, 74, 74, 74, 73, 70, 65, 62],
+            [6, 6, 5, 3, 1, 0, 0, 0, 1, 2, 3, 5]),
+    'BER': ([0, 1, 5, 10, 14, 18, 20, 19, 15, 10, 5, 2],
+            [85, 82, 77, 70, 68, 68, 68, 70, 76, 82, 86, 87],
+            [10, 8, 9, 8, 9, 9, 9, 8, 8, 8, 9, 10]),
+    'AMS': ([4, 4, 6, 9, 13, 15, 18, 18, 15, 11, 7, 4],
+            [87, 84, 80, 74, 73, 75, 76, 77, 81, 84, 87, 88],
+            [12, 10, 11, 9, 10, 10, 10, 10, 11, 12, 13, 12])
+}
+
+# Used for cities without normals: a mild mid-latitude profile
+DEFAULT_NORMALS = ([8, 9, 12, 15, 19, 23, 25, 25, 22, 17, 12, 9],
+                   [75, 72, 70, 68, 67, 66, 65, 66, 70, 73, 76, 77],
+                   [9, 8, 8, 8, 7, 6, 5, 5, 6, 8, 9, 10])
+
+def _condition(rainy_days):
+    if rainy_days >= 15:
+        return 'Rain'
+    if rainy_days >= 12:
+        return 'Light Rain'
+    if rainy_days >= 8:
+        return 'Cloudy'
+    if rainy_days >= 4:
+        return 'Partly Cloudy'
+    return 'Clear'
+
+def _monthly_table(normals):
+    temps, humidity, rain = normals
+    return [{'condition': _condition(r), 'temp': float(t), 'humidity': h, 'source': 'climatology'}
+            for t, h, r in zip(temps, humidity, rain)]
+
+# Precomputed city ID -> 12 monthly entries
+CLIMATOLOGY = {city: _monthly_table(normals) for city, normals in CLIMATE_NORMALS.items()}
+DEFAULT_CLIMATOLOGY = _monthly_table(DEFAULT_NORMALS)
+
+def monthly_climate(destination, destination_id=None):
+    '''Monthly climatology (index 0 = January) for a city ID, else the best match for the typed name'''
+    if not destination_id:
+        matches = CITY_INDEX.lookup(destination)
+        destination_id = matches[0].id if matches else None
+    return CLIMATOLOGY.get(destination_id, DEFAULT_CLIMATOLOGY)
+
+def trip_dates(start_date, duration):
+    '''All trip dates as YYYY-MM-DD strings plus their 1-based months, built in one shot'''
+    days = np.datetime64(start_date, 'D') + np.arange(duration)
+    months = days.astype('datetime64[M]').astype(int) % 12 + 1
+    return np.datetime_as_string(days, unit='D').tolist(), months.tolist()
+
+def forecast_by_date(weather):
+    '''Collapse forecast entries to one per date, preferring the midday reading'''
+    by_date = {}
+    for entry in weather.get('list', []):
+        date = entry['dt_txt'][:10]
+        if date not in by_date or entry['dt_txt'][11:13] == '12':
+            by_date[date] = {
+                'condition': entry['weather'][0]['main'],
+                'temp': entry['main']['temp'],
+                'humidity': entry['main']['humidity'],
+                'source': 'forecast'
+            }
+    return by_date
+
+def daily_weather(weather, destination, start_date, duration, destination_id=None):
+    '''Per-day (date, weather) pairs: forecast where available, climatology beyond it'''
+    dates, months = trip_dates(start_date, duration)
+    forecast = forecast_by_date(weather)
+    climate = monthly_climate(destination, destination_id)
+    return [(date, forecast.get(date) or climate[month - 1]) for date, month in zip(dates, months)]
@@ -4,6 +4,83 @@ import google.generativeai as genai
 from amadeus import Client
 from dotenv import load_dotenv
 load_dotenv()
+
+INTEREST_CATEGORIES = ["Culture & Art", "Food & Gastronomy", "Adventure & Outdoor",
+                       "History & Heritage", "Shopping", "Nature & Wildlife", "Relaxation"]
+
+# Local attraction knowledge store
+ATTRACTION_STORE_PATH = os.getenv('ATTRACTION_STORE_PATH', os.path.join('data', 'attractions.db'))
+ATTRACTION_STORE_TTL_DAYS = int(os.getenv('ATTRACTION_STORE_TTL_DAYS', '30'))
+ATTRACTION_STORE_MIN_RESULTS = int(os.getenv('ATTRACTION_STORE_MIN_RESULTS', '5'))
+
+# Provider racing
+PROVIDER_GRACE_SECONDS = float(os.getenv('PROVIDER_GRACE_SECONDS', '0.5'))
+PROVIDER_TIMEOUT_SECONDS = float(os.getenv('PROVIDER_TIMEOUT_SECONDS', '20'))
+PROVIDER_MAX_WORKERS = int(os.getenv('PROVIDER_MAX_WORKERS', '16'))
+PROVIDER_HEDGE_MIN_SAMPLES = int(os.getenv('PROVIDER_HEDGE_MIN_SAMPLES', '5'))
+
+# Circuit breakers and metrics
+CIRCUIT_WINDOW_SIZE = int(os.getenv('CIRCUIT_WINDOW_SIZE', '20'))
+CIRCUIT_MIN_CALLS = int(os.getenv('CIRCUIT_MIN_CALLS', '5'))
+CIRCUIT_ERROR_RATE = float(os.getenv('CIRCUIT_ERROR_RATE', '0.5'))
+CIRCUIT_SLOW_CALL_SECONDS = float(os.getenv('CIRCUIT_SLOW_CALL_SECONDS', '10'))
+CIRCUIT_OPEN_SECONDS = float(os.getenv('CIRCUIT_OPEN_SECONDS', '30'))
+METRICS_EXPORT_PATH = os.getenv('METRICS_EXPORT_PATH', '')
+
+# Response cache and speculative prefetch
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv('RESPONSE_CACHE_TTL_SECONDS', '900'))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '512'))
+PREFETCH_WORKERS = int(os.getenv('PREFETCH_WORKERS', '4'))
+PREFETCH_MAX_PER_SESSION = int(os.getenv('PREFETCH_MAX_PER_SESSION', '12'))
+
+# Background plan jobs. 'thread' shares the server's caches, circuit breakers and
+# metrics, so the provider health panel and metrics export see plan traffic.
+# 'process' isolates plans in worker processes, each with its own cache, breakers
+# and metrics that the server never sees.
+PLAN_WORKERS = int(os.getenv('PLAN_WORKERS', '2'))
+PLAN_WORKER_MODE = os.getenv('PLAN_WORKER_MODE', 'thread')
+JOB_POLL_SECONDS = float(os.getenv('JOB_POLL_SECONDS', '0.5'))
+JOB_HISTORY_SIZE = int(os.getenv('JOB_HISTORY_SIZE', '100'))
+
+# Itinerary rendering
+ITINERARY_DAYS_PER_PAGE = int(os.getenv('ITINERARY_DAYS_PER_PAGE', '7'))
+
+# Charts: 'plotly', 'native' (Streamlit's built-in charts) or 'auto', which uses
+# native charts for the per-day weather charts of trips this long or longer
+CHART_MODE = os.getenv('CHART_MODE', 'auto')
+CHART_NATIVE_MIN_DAYS = int(os.getenv('CHART_NATIVE_MIN_DAYS', '30'))
+
+# Provider response cassettes: 'off', 'record' (capture real responses) or
+# 'replay' (serve recorded responses offline, latency scaled by CASSETTE_LATENCY_SCALE)
+CASSETTE_MODE = os.getenv('CASSETTE_MODE', 'off')
+CASSETTE_DIR = os.getenv('CASSETTE_DIR', 'cassettes')
+CASSETTE_LATENCY_SCALE = float(os.getenv('CASSETTE_LATENCY_SCALE', '1.0'))
+
+# Persistent plan store: plans are content-addressed and kept until the
+# database grows past PLAN_STORE_MAX_MB (least recently opened go first)
+PLAN_STORE_PATH = os.getenv('PLAN_STORE_PATH', os.path.join('data', 'plans.db'))
+PLAN_STORE_MAX_MB = float(os.getenv('PLAN_STORE_MAX_MB', '200'))
+PLAN_STORE_FRESHNESS_HOURS = float(os.getenv('PLAN_STORE_FRESHNESS_HOURS', '24'))
+
+# Group trips: Amadeus flight searches accept at most 9 seated travellers
+GROUP_MAX_TRAVELERS = int(os.getenv('GROUP_MAX_TRAVELERS', '9'))
+CHILD_COST_FACTOR = float(os.getenv('CHILD_COST_FACTOR', '0.75'))
+
+# Gemini prompts: output limits per call, plus a token budget and deadline per plan
+# after which the agent falls back to simulated attractions and default reasoning text
+GEMINI_TEMPERATURE = float(os.getenv('GEMINI_TEMPERATURE', '0.4'))
+GEMINI_ATTRACTIONS_MAX_TOKENS = int(os.getenv('GEMINI_ATTRACTIONS_MAX_TOKENS', '1200'))
+GEMINI_REASONING_MAX_TOKENS = int(os.getenv('GEMINI_REASONING_MAX_TOKENS', '220'))
+GEMINI_PLAN_TOKEN_BUDGET = int(os.getenv('GEMINI_PLAN_TOKEN_BUDGET', '3000'))
+GEMINI_PLAN_DEADLINE_SECONDS = float(os.getenv('GEMINI_PLAN_DEADLINE_SECONDS', '15'))
+
+# Currency handling: budgets are in BASE_CURRENCY, provider offers are converted
+BASE_CURRENCY = os.getenv('BASE_CURRENCY', 'USD')
+FX_RATES_URL = os.getenv('FX_RATES_URL', 'https://open.er-api.com/v6/latest/USD')
+FX_CACHE_PATH = os.getenv('FX_CACHE_PATH', os.path.join('data', 'fx_rates.json'))
+FX_TTL_HOURS = float(os.getenv('FX_TTL_HOURS', '24'))
+FX_RETRY_MINUTES = float(os.getenv('FX_RETRY_MINUTES', '15'))
+
 def load_api_keys():
     '''Load API keys from environment variables'''
     return {
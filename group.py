@@ -0,0 +1,28 @@
+import math
+from config import CHILD_COST_FACTOR
+
+def party(request):
+    '''Adults, children and rooms of a request, defaulting to one traveller in one room'''
+    adults = max(1, int(request.get('adults') or 1))
+    children = max(0, int(request.get('children') or 0))
+    rooms = min(adults, max(1, int(request.get('rooms') or 1)))
+    return {'adults': adults, 'children': children, 'rooms': rooms}
+
+def travelers(group):
+    return group['adults'] + group['children']
+
+def cost_units(group):
+    '''Multiplier for per-person costs: each child counts as CHILD_COST_FACTOR of an adult'''
+    return group['adults'] + group['children'] * CHILD_COST_FACTOR
+
+def adults_per_room(group):
+    '''Adults to request per room when the party is spread evenly over its rooms'''
+    return math.ceil(group['adults'] / group['rooms'])
+
+def describe_party(group):
+    '''e.g. "2 adults, 1 child, 1 room"'''
+    parts = [f"{group['adults']} adult{'s' if group['adults'] != 1 else ''}"]
+    if group['children']:
+        parts.append(f"{group['children']} child{'ren' if group['children'] != 1 else ''}")
+    parts.append(f"{group['rooms']} room{'s' if group['rooms'] != 1 else ''}")
+    return ', '.join(parts)
@@ -0,0 +1,165 @@
+import time
+import queue
+import uuid
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from config import initialize_apis, PLAN_WORKERS, PLAN_WORKER_MODE, JOB_HISTORY_SIZE
+from api_handlers import request_cache_keys
+from cache import response_cache
+from providers import collect_notices
+from plan_store import save_plan, plan_id_for
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = 'queued', 'running', 'done', 'failed', 'cancelled'
+ACTIVE_STATES = (QUEUED, RUNNING)
+
+STAGES = [
+    ('perceive', 25, "🔍 Perceiving: Gathering data..."),
+    ('reason', 50, "🧠 Reasoning: Analyzing options..."),
+    ('plan', 75, "📋 Planning: Creating itinerary..."),
+    ('act', 100, "🚀 Acting: Compiling results...")
+]
+
+class JobCancelled(Exception):
+    pass
+
+def run_plan_job(job_id, user_input, warm_cache, events, cancelled):
+    '''Worker entry point: run the agent pipeline and report progress events'''
+    from agent import TravelAgent
+    from scenarios import run_scenarios
+
+    response_cache.seed(warm_cache)
+    agent = TravelAgent(user_input, initialize_apis())
+
+    # Provider fallbacks are reported with the plan; this thread has no Streamlit session
+    with collect_notices() as notices:
+        for method, progress, message in STAGES:
+            if cancelled.get(job_id):
+                raise JobCancelled(job_id)
+            events.put((job_id, progress, message))
+            getattr(agent, method)()
+
+    output = {'result': agent.final_output, 'notices': notices}
+    if user_input.get('compare_scenarios'):
+        output['scenarios'] = run_scenarios(agent)
+    save_plan(agent.final_output['plan_id'], user_input, output)
+    return output
+
+class JobManager:
+    '''Runs plan jobs on a local worker pool and tracks their progress.
+
+    Identical requests that are still running (or recently finished) share
+    one job. Progress events flow back over a queue and are applied whenever
+    a session polls status().
+    '''
+
+    def __init__(self, workers=PLAN_WORKERS, mode=PLAN_WORKER_MODE, history=JOB_HISTORY_SIZE):
+        if mode == 'process':
+            ctx = multiprocessing.get_context('spawn')
+            self._manager = ctx.Manager()
+            self._events = self._manager.Queue()
+            self._cancelled = self._manager.dict()
+            self._pool = ProcessPoolExecutor(max_workers=workers, mp_context=ctx)
+        else:
+            self._events = queue.Queue()
+            self._cancelled = {}
+            self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='plan-job')
+        self.history = history
+        self._jobs = OrderedDict()
+        self._by_key = {}
+        self._lock = threading.Lock()
+
+    def submit(self, user_input):
+        '''Enqueue a plan job and return its ID (an existing ID for duplicate requests)'''
+        # Keyed like the plan store, so a finished job is not reused once its freshness window rolls over
+        key = plan_id_for(user_input)
+        with self._lock:
+            existing = self._jobs.get(self._by_key.get(key))
+            if existing and existing['state'] not in (FAILED, CANCELLED):
+                return existing['id']
+
+            job_id = uuid.uuid4().hex[:12]
+            request = {k: v for k, v in user_input.items() if k != 'submitted'}
+            warm_cache = response_cache.export(request_cache_keys(request))
+            job = {
+                'id': job_id, 'key': key, 'request': request, 'state': QUEUED,
+                'progress': 0, 'message': "⏳ Queued...", 'events': [],
+                'result': None, 'error': None, 'submitted_at': time.time()
+            }
+            job['future'] = self._pool.submit(run_plan_job, job_id, request, warm_cache,
+                                              self._events, self._cancelled)
+            self._jobs[job_id] = job
+            self._by_key[key] = job_id
+            self._trim()
+        return job_id
+
+    def status(self, job_id):
+        '''Apply pending progress events and return a snapshot of the job'''
+        self._drain_events()
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            future = job['future']
+            if job['state'] in ACTIVE_STATES and future.done():
+                if future.cancelled():
+                    job['state'] = CANCELLED
+                else:
+                    try:
+                        job['result'] = future.result()
+                        job['state'] = DONE
+                    except JobCancelled:
+                        job['state'] = CANCELLED
+                    except Exception as e:
+                        job['state'] = FAILED
+                        job['error'] = str(e)
+                self._cancelled.pop(job_id, None)
+            return {k: v for k, v in job.items() if k != 'future'}
+
+    def cancel(self, job_id):
+        '''Cancel a queued job, or ask a running one to stop at the next stage'''
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job['state'] not in ACTIVE_STATES:
+                return False
+            if not job['future'].cancel():
+                self._cancelled[job_id] = True
+            job['message'] = "🛑 Cancelling..."
+        return True
+
+    def _drain_events(self):
+        while True:
+            try:
+                job_id, progress, message = self._events.get_nowait()
+            except queue.Empty:
+                return
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is not None and job['state'] in ACTIVE_STATES:
+                    job['state'] = RUNNING
+                    job['progress'] = progress
+                    job['message'] = message
+                    job['events'].append((time.time(), progress, message))
+
+    def _trim(self):
+        while len(self._jobs) > self.history:
+            for job_id, job in self._jobs.items():
+                if job['state'] not in ACTIVE_STATES:
+                    del self._jobs[job_id]
+                    if self._by_key.get(job['key']) == job_id:
+                        del self._by_key[job['key']]
+                    break
+            else:
+                return
+
+_MANAGER = None
+_MANAGER_LOCK = threading.Lock()
+
+def get_job_manager():
+    '''Process-wide job manager, started on first use'''
+    global _MANAGER
+    with _MANAGER_LOCK:
+        if _MANAGER is None:
+            _MANAGER = JobManager()
+        return _MANAGER
@@ -0,0 +1,139 @@
+import os
+import json
+import time
+import threading
+import requests
+from config import BASE_CURRENCY, FX_RATES_URL, FX_CACHE_PATH, FX_TTL_HOURS, FX_RETRY_MINUTES
+from circuit_breaker import get_breaker
+
+# Units of each currency per 1 USD, used when no rate table has been fetched yet
+FALLBACK_FX_RATES = {
+    'USD': 1.0, 'EUR': 0.92, 'GBP': 0.79, 'JPY': 150.0, 'INR': 83.0, 'AUD': 1.52,
+    'CAD': 1.36, 'CHF': 0.88, 'CNY': 7.2, 'SGD': 1.34, 'AED': 3.67, 'THB': 36.0,
+    'TRY': 32.0, 'MXN': 17.0, 'BRL': 5.0, 'ZAR': 18.5
+}
+
+FX_BREAKER = get_breaker('fx')
+_fx_lock = threading.Lock()
+_fx_memo = {'rates': None, 'fetched_at': 0.0, 'retry_at': 0.0, 'refreshing': False}
+
+def _read_fx_file(path):
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        return data['rates'], data['fetched_at']
+    except (OSError, ValueError, KeyError):
+        return None, 0.0
+
+def _download_fx_rates(path):
+    if not FX_BREAKER.allow():
+        return None
+    try:
+        with FX_BREAKER.track():
+            response = requests.get(FX_RATES_URL, timeout=5)
+            response.raise_for_status()
+            rates = response.json()['rates']
+    except Exception:
+        return None
+
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'rates': rates, 'fetched_at': time.time()}, f)
+    os.replace(tmp_path, path)
+    return rates
+
+def get_fx_rates(path=FX_CACHE_PATH, ttl_hours=FX_TTL_HOURS, retry_minutes=FX_RETRY_MINUTES):
+    '''USD-based FX table from memory, the local cache file, or a refresh once it is stale.
+
+    One caller refreshes at a time, outside the lock; everyone else keeps using the
+    stale (or fallback) table. A failed refresh is not retried for retry_minutes.
+    '''
+    with _fx_lock:
+        now = time.time()
+        memo = _fx_memo
+        if memo['rates'] and now - memo['fetched_at'] < ttl_hours * 3600:
+            return memo['rates']
+        if memo['rates'] and (memo['refreshing'] or now < memo['retry_at']):
+            return memo['rates']
+
+        rates, fetched_at = _read_fx_file(path)
+        if rates and now - fetched_at < ttl_hours * 3600:
+            memo.update(rates=rates, fetched_at=fetched_at)
+            return rates
+        stale = rates or memo['rates'] or FALLBACK_FX_RATES
+        memo.update(rates=stale, fetched_at=fetched_at if rates else memo['fetched_at'])
+        if memo['refreshing'] or now < memo['retry_at']:
+            return stale
+        memo['refreshing'] = True
+
+    fresh = None
+    try:
+        fresh = _download_fx_rates(path)
+    finally:
+        with _fx_lock:
+            _fx_memo['refreshing'] = False
+            if fresh:
+                _fx_memo.update(rates=fresh, fetched_at=time.time())
+            else:
+                _fx_memo['retry_at'] = time.time() + retry_minutes * 60
+    return fresh or stale
+
+def convert(amount, currency, rates, to=BASE_CURRENCY):
+    '''Convert an amount between currencies using a USD-based rate table'''
+    currency = (currency or BASE_CURRENCY).upper()
+    if currency == to:
+        return float(amount)
+    from_rate = rates.get(currency, FALLBACK_FX_RATES.get(currency))
+    to_rate = rates.get(to, FALLBACK_FX_RATES.get(to))
+    if not from_rate or not to_rate:
+        return float(amount)
+    return float(amount) / from_rate * to_rate
+
+def offer_amount(price, rates, to=BASE_CURRENCY):
+    '''Total of an Amadeus-style price dict ({'total', 'currency'}) in the base currency'''
+    return convert(float(price['total']), price.get('currency'), rates, to)
+
+def format_money(amount, currency=BASE_CURRENCY):
+    '''Display an amount with its currency, e.g. $1,234.50 or 1,234.50 EUR'''
+    if (currency or BASE_CURRENCY).upper() == 'USD':
+        return f"${amount:,.2f}"
+    return f"{amount:,.2f} {currency.upper()}"
+
+class CostLedger:
+    '''Every planned cost recorded once, aggregated in a single pass'''
+
+    def __init__(self, rates, currency=BASE_CURRENCY):
+        self.rates = rates
+        self.currency = currency
+        self.items = []
+        self._totals = None
+
+    def add(self, category, label, amount, currency=None, day=None):
+        currency = (currency or self.currency).upper()
+        self.items.append({
+            'category': category,
+            'label': label,
+            'amount': float(amount),
+            'currency': currency,
+            'base_amount': round(convert(amount, currency, self.rates, self.currency), 2),
+            'day': day
+        })
+        self._totals = None
+
+    def totals(self):
+        '''Totals by category and by day plus the grand total'''
+        if self._totals is None:
+            by_category, by_day, total = {}, {}, 0.0
+            for item in self.items:
+                amount = item['base_amount']
+                by_category[item['category']] = by_category.get(item['category'], 0.0) + amount
+                if item['day'] is not None:
+                    by_day[item['day']] = by_day.get(item['day'], 0.0) + amount
+                total += amount
+            self._totals = {'by_category': by_category, 'by_day': by_day, 'total': total}
+        return self._totals
+
+    def to_dict(self):
+        return {'currency': self.currency, 'items': self.items, 'totals': self.totals()}
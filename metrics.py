@@ -0,0 +1,79 @@
+import os
+import threading
+from config import METRICS_EXPORT_PATH
+
+_LOCK = threading.Lock()
+_COUNTERS = {}
+_GAUGES = {}
+_SUMMARIES = {}
+_HELP = {}
+
+def _key(name, labels):
+    return name, tuple(sorted((labels or {}).items()))
+
+def describe(name, text):
+    _HELP[name] = text
+
+def inc(name, labels=None, value=1):
+    '''Increment a counter'''
+    key = _key(name, labels)
+    with _LOCK:
+        _COUNTERS[key] = _COUNTERS.get(key, 0) + value
+
+def set_gauge(name, labels=None, value=0):
+    '''Set a gauge to an absolute value'''
+    with _LOCK:
+        _GAUGES[_key(name, labels)] = value
+
+def observe(name, labels=None, value=0):
+    '''Record one observation of a summary (exported as _sum and _count)'''
+    key = _key(name, labels)
+    with _LOCK:
+        total, count = _SUMMARIES.get(key, (0.0, 0))
+        _SUMMARIES[key] = (total + value, count + 1)
+
+def snapshot():
+    '''Copy of all metric values keyed by (name, labels)'''
+    with _LOCK:
+        return {'counters': dict(_COUNTERS), 'gauges': dict(_GAUGES), 'summaries': dict(_SUMMARIES)}
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{v}"' for k, v in labels) + '}'
+
+def export_prometheus():
+    '''Render all metrics in the Prometheus text exposition format'''
+    data = snapshot()
+    lines = []
+    seen = set()
+
+    def header(name, kind):
+        if name not in seen:
+            seen.add(name)
+            if name in _HELP:
+                lines.append(f'# HELP {name} {_HELP[name]}')
+            lines.append(f'# TYPE {name} {kind}')
+
+    for (name, labels), value in sorted(data['counters'].items()):
+        header(name, 'counter')
+        lines.append(f'{name}{_format_labels(labels)} {value}')
+    for (name, labels), value in sorted(data['gauges'].items()):
+        header(name, 'gauge')
+        lines.append(f'{name}{_format_labels(labels)} {value}')
+    for (name, labels), (total, count) in sorted(data['summaries'].items()):
+        header(name, 'summary')
+        lines.append(f'{name}_sum{_format_labels(labels)} {total}')
+        lines.append(f'{name}_count{_format_labels(labels)} {count}')
+
+    return '\n'.join(lines) + '\n'
+
+def write_metrics(path=METRICS_EXPORT_PATH):
+    '''Atomically write metrics to a textfile (e.g. for a node_exporter textfile collector)'''
+    if not path:
+        return False
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(export_prometheus())
+    os.replace(tmp_path, path)
+    return True
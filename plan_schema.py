@@ -0,0 +1,55 @@
+from cache import response_cache
+
+def _float(value, default=0.0):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+def compact_flight(flight):
+    '''Keep only the flight fields the renderers and exports use'''
+    if not flight:
+        return None
+    itinerary = flight['itineraries'][0]
+    segment = itinerary['segments'][0]
+    return {
+        'id': flight.get('id'),
+        'airline': flight.get('validatingAirlineCodes', ['N/A'])[0],
+        'flight_number': f"{segment.get('carrierCode', 'XX')}-{segment.get('number', '0000')}",
+        'departure': segment['departure']['at'],
+        'arrival': segment['arrival']['at'],
+        'duration': itinerary.get('duration', ''),
+        'price': _float(flight['price']['total']),
+        'currency': flight['price'].get('currency', 'USD')
+    }
+
+def compact_hotel(hotel):
+    '''Keep only the hotel fields the renderers and exports use'''
+    if not hotel:
+        return None
+    offer = hotel['offers'][0]
+    total = _float(offer['price']['total'])
+    return {
+        'name': hotel['hotel']['name'],
+        'rating': int(_float(hotel['hotel'].get('rating', 4), 4)),
+        'room': offer.get('room', {}).get('description', {}).get('text', 'Standard Room'),
+        'price_per_night': _float(offer['price'].get('base'), total),
+        'rooms': int(_float(offer.get('roomQuantity', 1), 1)),
+        'price': total,
+        'currency': offer['price'].get('currency', 'USD'),
+        'amenities': hotel.get('amenities', ['WiFi', 'Breakfast'])[:3]
+    }
+
+def compact_weather(daily):
+    '''Per-day weather rows from (date, weather) pairs, flagged forecast or climatology'''
+    return [{
+        'date': date,
+        'temp': weather['temp'],
+        'condition': weather['condition'],
+        'humidity': weather['humidity'],
+        'source': weather['source']
+    } for date, weather in daily]
+
+def get_raw(ref):
+    '''Look up a raw provider payload referenced from a plan, if still cached'''
+    return response_cache.peek(ref) if ref else None
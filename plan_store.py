@@ -0,0 +1,92 @@
+import json
+import time
+import zlib
+import sqlite3
+from config import (
+    PLAN_STORE_PATH, PLAN_STORE_MAX_MB, PLAN_STORE_FRESHNESS_HOURS,
+    BASE_CURRENCY, CASSETTE_MODE
+)
+from utils import normalize_request, request_fingerprint
+from sqlite_store import connect
+
+# Bump when the stored plan output changes shape so old plans are not reused
+PLAN_SCHEMA_VERSION = 2
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS plans (
+    id TEXT PRIMARY KEY,
+    destination TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    request TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL,
+    accessed_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_plans_destination_dates ON plans(destination, start_date, end_date);
+CREATE INDEX IF NOT EXISTS idx_plans_accessed ON plans(accessed_at);
+'''
+
+def data_versions(now=None):
+    '''Everything besides the request that changes what a plan would contain'''
+    now = time.time() if now is None else now
+    return {
+        'schema': PLAN_SCHEMA_VERSION,
+        'currency': BASE_CURRENCY,
+        'replay': CASSETTE_MODE == 'replay',
+        # Provider prices and forecasts go stale; plans roll over each window
+        'window': int(now // (PLAN_STORE_FRESHNESS_HOURS * 3600))
+    }
+
+def plan_id_for(request, now=None):
+    '''Content address of a request: the ID its plan is stored and shared under'''
+    return request_fingerprint(request, extra=data_versions(now))
+
+def get_plan(plan_id, path=PLAN_STORE_PATH):
+    '''Return (output, request) for a stored plan, or None'''
+    with connect(path, SCHEMA) as conn:
+        row = conn.execute('SELECT request, payload FROM plans WHERE id = ?', (plan_id,)).fetchone()
+        if row is None:
+            return None
+        conn.execute('UPDATE plans SET accessed_at = ? WHERE id = ?', (time.time(), plan_id))
+    return json.loads(zlib.decompress(row['payload'])), json.loads(row['request'])
+
+def save_plan(plan_id, request, output, path=PLAN_STORE_PATH, max_mb=PLAN_STORE_MAX_MB):
+    '''Store a plan under its ID, then trim the store back under its size budget'''
+    payload = zlib.compress(json.dumps(output).encode('utf-8'))
+    normalized = normalize_request(request)
+    now = time.time()
+    with connect(path, SCHEMA) as conn:
+        conn.execute(
+            '''INSERT OR REPLACE INTO plans
+               (id, destination, start_date, end_date, request, payload, size, created_at, accessed_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+            (plan_id, normalized['destination'], request['start_date'], request['end_date'],
+             json.dumps(request, default=str), payload, len(payload), now, now)
+        )
+        # Keep the most recently opened plans that fit in the budget
+        conn.execute(
+            '''DELETE FROM plans WHERE id IN (
+                   SELECT id FROM (
+                       SELECT id, SUM(size) OVER (ORDER BY accessed_at DESC, id) AS running
+                       FROM plans
+                   ) WHERE running > ?
+               )''',
+            (int(max_mb * 1024 * 1024),)
+        )
+
+def find_plans(destination, start_date=None, end_date=None, limit=20, path=PLAN_STORE_PATH):
+    '''Stored plans for a destination whose dates overlap the given range, newest first'''
+    sql = 'SELECT id, destination, start_date, end_date, size, created_at FROM plans WHERE destination = ?'
+    params = [' '.join(destination.lower().split())]
+    if end_date:
+        sql += ' AND start_date <= ?'
+        params.append(end_date)
+    if start_date:
+        sql += ' AND end_date >= ?'
+        params.append(start_date)
+    sql += ' ORDER BY created_at DESC LIMIT ?'
+    params.append(limit)
+    with connect(path, SCHEMA) as conn:
+        return [dict(row) for row in conn.execute(sql, params)]
@@ -0,0 +1,77 @@
+import time
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from api_handlers import get_flights, get_hotels, get_weather, get_attractions_from_amadeus
+from config import PREFETCH_WORKERS, PREFETCH_MAX_PER_SESSION, RESPONSE_CACHE_TTL_SECONDS
+from group import party
+
+_EXECUTOR = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix='prefetch')
+
+class Prefetcher:
+    '''Speculative per-session fetches that warm the response cache.
+
+    update() is called on every rerun with the draft form fields; it starts a
+    background fetch for each provider request those fields already determine,
+    cancels queued fetches that no longer match the form, and stops once the
+    session has used up its speculative budget. Finished fetches are forgotten
+    once their cached responses have expired, so they can be prefetched again.
+    '''
+
+    def __init__(self, apis, budget=PREFETCH_MAX_PER_SESSION):
+        self.apis = apis
+        self.budget = budget
+        self.started = 0
+        self.tasks = {}
+
+    def update(self, fields):
+        wanted = self._wanted_tasks(fields)
+        now = time.monotonic()
+
+        for key, (future, started_at) in list(self.tasks.items()):
+            if future.done() and now - started_at > RESPONSE_CACHE_TTL_SECONDS:
+                del self.tasks[key]
+            elif key not in wanted and future.cancel():
+                del self.tasks[key]
+                self.started -= 1
+
+        for key, fn in wanted.items():
+            if key in self.tasks or self.started >= self.budget:
+                continue
+            self.tasks[key] = (_EXECUTOR.submit(fn), now)
+            self.started += 1
+
+    def cancel_all(self):
+        '''Drop queued speculative fetches, e.g. once the real plan request is submitted'''
+        for key, (future, _) in list(self.tasks.items()):
+            if future.cancel():
+                del self.tasks[key]
+                self.started -= 1
+
+    def _wanted_tasks(self, fields):
+        apis = self.apis
+        # Only canonical cities are prefetched; unresolved text would just send doomed queries
+        destination, destination_id = fields.get('destination'), fields.get('destination_id')
+        origin, origin_id = fields.get('origin'), fields.get('origin_id')
+        start, end = fields.get('start_date'), fields.get('end_date')
+        group = party(fields)
+        tasks = {}
+
+        if not destination_id:
+            return tasks
+
+        dates_known = bool(start and end and end > start)
+        duration = (datetime.strptime(end, '%Y-%m-%d') - datetime.strptime(start, '%Y-%m-%d')).days if dates_known else 1
+
+        if apis['weather_key']:
+            weather_start = start or datetime.today().strftime('%Y-%m-%d')
+            tasks[('weather', destination_id)] = lambda: get_weather(apis, destination, weather_start, duration, destination_id)
+        if apis['amadeus']:
+            tasks[('attractions', destination_id)] = lambda: get_attractions_from_amadeus(apis, destination, destination_id)
+            if dates_known:
+                tasks[('hotels', destination_id, start, end, group['adults'], group['rooms'])] = lambda: get_hotels(
+                    apis, destination, start, end, duration, destination_id, group['adults'], group['rooms'])
+                if origin_id:
+                    tasks[('flights', origin_id, destination_id, start, end, group['adults'], group['children'])] = \
+                        lambda: get_flights(apis, origin, destination, start, end, origin_id, destination_id,
+                                            group['adults'], group['children'])
+        return tasks
@@ -0,0 +1,110 @@
+import time
+import threading
+from collections import namedtuple
+import metrics
+from config import (
+    GEMINI_TEMPERATURE, GEMINI_ATTRACTIONS_MAX_TOKENS, GEMINI_REASONING_MAX_TOKENS,
+    GEMINI_PLAN_TOKEN_BUDGET, GEMINI_PLAN_DEADLINE_SECONDS
+)
+
+Prompt = namedtuple('Prompt', ['name', 'version', 'template', 'max_output_tokens', 'temperature'])
+
+# Bump a prompt's version whenever its template changes: the version is part of the
+# response cache and cassette keys, so answers to an older wording are not reused
+PROMPTS = {
+    'attractions': Prompt(
+        'attractions', 2,
+        'List 15 real, popular attractions in {place} for these interests: {interests}. '
+        'Mix free and paid, vary durations, prices in USD. '
+        'Return ONLY a JSON array of '
+        '{{"name": str, "rating": 0-5, "price": number, "duration": "2-3 hours", "description": "under 15 words"}}.',
+        GEMINI_ATTRACTIONS_MAX_TOKENS, GEMINI_TEMPERATURE
+    ),
+    'reasoning': Prompt(
+        'reasoning', 3,
+        'Trip to {destination}: {duration} days, {budget} budget, interests: {interests}. '
+        'Give brief practical recommendations in under 120 words.',
+        GEMINI_REASONING_MAX_TOKENS, GEMINI_TEMPERATURE
+    )
+}
+
+metrics.describe('llm_calls_total', 'Gemini calls by prompt and outcome')
+metrics.describe('llm_latency_seconds', 'Gemini call latency by prompt')
+metrics.describe('llm_prompt_tokens_total', 'Gemini input tokens by prompt')
+metrics.describe('llm_output_tokens_total', 'Gemini output tokens by prompt')
+metrics.describe('llm_budget_skips_total', 'Gemini calls skipped by the per-plan token budget or deadline')
+
+def prompt_key(name):
+    '''Cache key prefix for a prompt, e.g. gemini.reasoning.v2'''
+    return f'gemini.{name}.v{PROMPTS[name].version}'
+
+def render_prompt(name, **fields):
+    return PROMPTS[name].template.format(**fields)
+
+def estimate_tokens(text):
+    '''Rough token count (about 4 characters per token) used before a call is made'''
+    return len(text) // 4 + 1
+
+class TokenBudget:
+    '''Gemini tokens and wall-clock time one plan may spend before using its fallbacks'''
+
+    def __init__(self, tokens=GEMINI_PLAN_TOKEN_BUDGET, seconds=GEMINI_PLAN_DEADLINE_SECONDS):
+        self.tokens = tokens
+        self.used = 0
+        self.deadline = time.monotonic() + seconds
+        self._lock = threading.Lock()
+
+    def seconds_left(self):
+        return max(0.0, self.deadline - time.monotonic())
+
+    def allows(self, name, text):
+        '''Whether a call could finish within the budget, assuming it uses all its output tokens'''
+        reason = None
+        with self._lock:
+            if self.seconds_left() <= 0:
+                reason = 'deadline'
+            elif self.used + estimate_tokens(text) + PROMPTS[name].max_output_tokens > self.tokens:
+                reason = 'tokens'
+        if reason:
+            metrics.inc('llm_budget_skips_total', {'prompt': name, 'reason': reason})
+        return reason is None
+
+    def spend(self, tokens):
+        with self._lock:
+            self.used += tokens
+
+def generate(model, name, text, budget=None):
+    '''Run a rendered prompt with its output limits and return the response text.
+
+    The call's deadline is whatever is left of the plan's budget. Token counts come
+    from the response's usage metadata when the client reports it, else are estimated.
+    '''
+    prompt = PROMPTS[name]
+    labels = {'prompt': f'{name}.v{prompt.version}'}
+    options = {}
+    if budget is not None:
+        options['request_options'] = {'timeout': max(1.0, budget.seconds_left())}
+
+    start = time.monotonic()
+    try:
+        response = model.generate_content(
+            text,
+            generation_config={'max_output_tokens': prompt.max_output_tokens, 'temperature': prompt.temperature},
+            **options
+        )
+        result = response.text
+    except Exception:
+        metrics.inc('llm_calls_total', {**labels, 'outcome': 'failure'})
+        raise
+    finally:
+        metrics.observe('llm_latency_seconds', labels, time.monotonic() - start)
+
+    usage = getattr(response, 'usage_metadata', None)
+    input_tokens = getattr(usage, 'prompt_token_count', None) or estimate_tokens(text)
+    output_tokens = getattr(usage, 'candidates_token_count', None) or estimate_tokens(result)
+    metrics.inc('llm_calls_total', {**labels, 'outcome': 'success'})
+    metrics.inc('llm_prompt_tokens_total', labels, input_tokens)
+    metrics.inc('llm_output_tokens_total', labels, output_tokens)
+    if budget is not None:
+        budget.spend(input_tokens + output_tokens)
+    return result
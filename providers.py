@@ -0,0 +1,165 @@
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import metrics
+from config import (
+    PROVIDER_GRACE_SECONDS, PROVIDER_TIMEOUT_SECONDS, PROVIDER_MAX_WORKERS,
+    PROVIDER_HEDGE_MIN_SAMPLES
+)
+
+_EXECUTOR = ThreadPoolExecutor(max_workers=PROVIDER_MAX_WORKERS, thread_name_prefix='provider')
+_REGISTRY = {}
+_FALLBACKS = {}
+_LOCK = threading.Lock()
+_local = threading.local()
+
+metrics.describe('provider_races_total', 'Provider races run, by data kind')
+metrics.describe('provider_fallbacks_total', 'Races that fell back to simulated data, by data kind')
+
+class Provider:
+    '''A data source for one kind of data (attractions, flights, ...)'''
+
+    def __init__(self, kind, name, fn, priority=0):
+        self.kind = kind
+        self.name = name
+        self.fn = fn
+        self.priority = priority
+        self.latencies = deque(maxlen=100)
+
+    def record(self, seconds):
+        with _LOCK:
+            self.latencies.append(seconds)
+
+    def hedge_after(self):
+        '''p95 latency in seconds, or None until enough samples are collected'''
+        with _LOCK:
+            samples = sorted(self.latencies)
+        if len(samples) < PROVIDER_HEDGE_MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+def register_provider(kind, name, fn, priority=0):
+    '''Register fn(apis, query) as a provider; higher priority wins ties in a race'''
+    with _LOCK:
+        providers = [p for p in _REGISTRY.get(kind, []) if p.name != name]
+        providers.append(Provider(kind, name, fn, priority))
+        _REGISTRY[kind] = sorted(providers, key=lambda p: -p.priority)
+
+def register_fallback(kind, fn):
+    '''Register fn(query) used when no provider returns a good result in time'''
+    with _LOCK:
+        _FALLBACKS[kind] = fn
+
+def get_providers(kind):
+    with _LOCK:
+        return list(_REGISTRY.get(kind, []))
+
+def hedging():
+    '''True while running a hedged duplicate call, which must not join the original request'''
+    return getattr(_local, 'hedge', False)
+
+def notify(message):
+    '''Report a provider problem (e.g. a fallback to simulated data) to the plan being built.
+
+    Plans run in background jobs with no Streamlit session, so notices are collected
+    with the plan and shown alongside its results; outside collect_notices() they are dropped.
+    '''
+    notices = getattr(_local, 'notices', None)
+    if notices is not None and message not in notices:
+        notices.append(message)
+
+@contextmanager
+def collect_notices():
+    '''Collect notify() messages from this thread and the provider calls it races'''
+    previous = getattr(_local, 'notices', None)
+    _local.notices = []
+    try:
+        yield _local.notices
+    finally:
+        _local.notices = previous
+
+def mark_round_trip():
+    '''Called by a provider that actually went to the network (or cassette) for its answer'''
+    _local.round_trip = True
+
+def _call(provider, apis, query, notices, hedge=False):
+    _local.notices = notices
+    _local.hedge = hedge
+    _local.round_trip = False
+    start = time.monotonic()
+    try:
+        result = provider.fn(apis, query)
+    finally:
+        _local.hedge = False
+        _local.notices = None
+    # Cache hits and in-handler fallbacks return almost instantly; sampling them would
+    # drag the p95 towards zero and hedge every real request immediately
+    if _local.round_trip:
+        provider.record(time.monotonic() - start)
+    return result
+
+def race(kind, apis, query, grace=PROVIDER_GRACE_SECONDS, timeout=PROVIDER_TIMEOUT_SECONDS):
+    '''Run all providers of a kind concurrently and return (result, source_name).
+
+    The highest-priority good result received within `grace` seconds of the first
+    good result wins. A provider still running past its p95 latency gets one hedged
+    duplicate request. Pending losers are cancelled; calls already running are
+    left to finish in the background and their results are discarded. If nothing
+    good arrives before `timeout`, the registered fallback is used.
+    '''
+    metrics.inc('provider_races_total', {'kind': kind})
+    providers = get_providers(kind)
+    if not providers:
+        return _fallback(kind, query)
+
+    notices = getattr(_local, 'notices', None)
+    start = time.monotonic()
+    deadline = start + timeout
+    grace_deadline = None
+    pending = {_EXECUTOR.submit(_call, p, apis, query, notices): p for p in providers}
+    hedged = set()
+    best = None
+
+    while pending:
+        wake = min(deadline, grace_deadline or deadline)
+        hedge_times = [start + t for p in set(pending.values()) if p.name not in hedged
+                       for t in [p.hedge_after()] if t is not None]
+        if hedge_times:
+            wake = min(wake, min(hedge_times))
+
+        done, _ = wait(pending, timeout=max(0, wake - time.monotonic()), return_when=FIRST_COMPLETED)
+        for future in done:
+            provider = pending.pop(future)
+            try:
+                result = future.result()
+            except Exception:
+                result = None
+            if result and (best is None or provider.priority > best[0].priority):
+                best = (provider, result)
+                if grace_deadline is None:
+                    grace_deadline = time.monotonic() + grace
+
+        now = time.monotonic()
+        if best and (now >= grace_deadline or
+                     not any(p.priority > best[0].priority for p in pending.values())):
+            break
+        if now >= deadline:
+            break
+
+        for provider in set(pending.values()):
+            threshold = provider.hedge_after()
+            if provider.name not in hedged and threshold is not None and now - start >= threshold:
+                hedged.add(provider.name)
+                pending[_EXECUTOR.submit(_call, provider, apis, query, notices, True)] = provider
+
+    for future in pending:
+        future.cancel()
+
+    return (best[1], best[0].name) if best else _fallback(kind, query)
+
+def _fallback(kind, query):
+    fn = _FALLBACKS.get(kind)
+    metrics.inc('provider_fallbacks_total', {'kind': kind})
+    return (fn(query), 'fallback') if fn else (None, None)
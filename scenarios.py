@@ -0,0 +1,57 @@
+import numpy as np
+from agent import BUDGET_CATEGORIES, STYLE_MULTIPLIERS
+from ledger import offer_amount
+
+def scenario_budgets(budget, steps=(0.75, 1.0, 1.25)):
+    '''Budget grid around the user's budget, rounded to the nearest 100'''
+    return sorted({int(round(budget * step / 100.0)) * 100 for step in steps})
+
+def allocate_budgets(styles, budgets):
+    '''Vectorized budget allocation: returns a styles x budgets x categories array'''
+    weights = np.array([[STYLE_MULTIPLIERS[style][c] for c in BUDGET_CATEGORIES] for style in styles])
+    amounts = np.asarray(budgets, dtype=float)
+    return (weights[:, None, :] * amounts[None, :, None]).astype(int)
+
+def select_hotel_indices(prices, hotel_budgets):
+    '''Pick the first hotel within 110% of each hotel budget, falling back to the first hotel'''
+    if not len(prices):
+        return np.full(hotel_budgets.shape, -1)
+    affordable = prices <= hotel_budgets[..., None] * 1.1
+    return np.where(affordable.any(axis=-1), affordable.argmax(axis=-1), 0)
+
+def run_scenarios(agent, styles=None, budgets=None):
+    '''Cost every travel style x budget pair from a single perception result'''
+    styles = list(styles or STYLE_MULTIPLIERS.keys())
+    budgets = list(budgets or scenario_budgets(agent.perceived_data['budget']))
+
+    allocations = allocate_budgets(styles, budgets)
+    hotels = agent.perceived_data['hotels']
+    prices = np.array([offer_amount(h['offers'][0]['price'], agent.fx_rates) for h in hotels])
+    hotel_idx = select_hotel_indices(prices, allocations[..., BUDGET_CATEGORIES.index('hotels')])
+
+    flights = agent.perceived_data['flights']
+    flight_prices = np.array([offer_amount(f['price'], agent.fx_rates) for f in flights])
+    flight_cost = float(flight_prices.min()) if flights else 0
+
+    rows = []
+    for i, style in enumerate(styles):
+        for j, budget in enumerate(budgets):
+            budget_strategy = dict(zip(BUDGET_CATEGORIES, allocations[i, j].tolist()))
+            hotel = hotels[hotel_idx[i, j]] if hotel_idx[i, j] >= 0 else None
+            hotel_cost = float(prices[hotel_idx[i, j]]) if hotel else 0
+
+            activities_cost = agent._activities_cost(budget_strategy)
+            total = flight_cost + hotel_cost + activities_cost
+
+            rows.append({
+                'Style': style,
+                'Budget': budget,
+                'Hotel': hotel['hotel']['name'] if hotel else 'N/A',
+                'Flights': flight_cost,
+                'Hotels': hotel_cost,
+                'Activities & Food': activities_cost,
+                'Total': total,
+                'Remaining': budget - total
+            })
+
+    return {'table': rows}
@@ -0,0 +1,22 @@
+import os
+import sqlite3
+from contextlib import contextmanager
+
+_initialized = set()
+
+@contextmanager
+def connect(path, schema):
+    '''Open a committed-on-exit SQLite connection, creating `schema` on first use of `path`'''
+    if (path, schema) not in _initialized and os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=5)
+    conn.row_factory = sqlite3.Row
+    try:
+        if (path, schema) not in _initialized:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(schema)
+            _initialized.add((path, schema))
+        with conn:
+            yield conn
+    finally:
+        conn.close()
@@ -1,51 +1,105 @@
 import streamlit as st
+from html import escape
 from datetime import datetime, timedelta
+from config import INTEREST_CATEGORIES, ITINERARY_DAYS_PER_PAGE, GROUP_MAX_TRAVELERS, BASE_CURRENCY
+from ledger import format_money
+from city_index import CITY_INDEX, city_label
+
+def _city_input(label, placeholder, key):
+    '''Free-text city field resolved against the local city index.
+
+    Returns the canonical City, or None when the text matches no known city (the
+    typed name is then planned as-is).
+    Ambiguous names and misspellings get a pick-list of suggestions.
+    '''
+    text = st.text_input(label, placeholder=placeholder, key=key)
+    if not text.strip():
+        return None
+    
+    matches = CITY_INDEX.lookup(text)
+    if len(matches) == 1:
+        st.caption(f"📍 {city_label(matches[0])}")
+        return matches[0]
+    
+    options = matches or CITY_INDEX.suggest(text)
+    if not options:
+        st.caption("⚠️ Not in the city index - it will be looked up online")
+        return None
+    return st.selectbox("Did you mean", options, format_func=city_label, key=f"{key}_match")
+
 def render_input_form():
     '''Render the main input form'''
     st.header("📝 Plan Your Perfect Trip")
     
+    # Trip basics sit outside the form so each change reruns the script and
+    # the prefetcher can start warming provider data before submit
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        destination = _city_input("🌍 Destination City*", "e.g., Paris, Tokyo", "destination")
+        start_date = st.date_input("📅 Start Date*", min_value=datetime.today(), value=datetime.today())
+    
+    with col2:
+        origin = _city_input("🏠 Departure City*", "e.g., London, Mumbai", "origin")
+        end_date = st.date_input("📅 End Date*", min_value=datetime.today() + timedelta(days=1), value=datetime.today() + timedelta(days=5))
+    
     with st.form("travel_form"):
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            destination = st.text_input("🌍 Destination City*", placeholder="e.g., Paris, Tokyo")
-            start_date = st.date_input("📅 Start Date*", min_value=datetime.today(), value=datetime.today())
-            budget = st.number_input("💰 Total Budget (USD)*", min_value=500, max_value=50000, step=100, value=2000)
+            budget = st.number_input(f"💰 Total Budget ({BASE_CURRENCY})*", min_value=500, max_value=50000, step=100, value=2000,
+                                     help="Budget for the whole group")
         
         with col2:
-            origin = st.text_input("🏠 Departure City*", placeholder="e.g., London, Mumbai")
-            end_date = st.date_input("📅 End Date*", min_value=datetime.today() + timedelta(days=1), value=datetime.today() + timedelta(days=5))
             travel_style = st.selectbox("🎨 Travel Style*", ["budget", "mid-range", "luxury"])
         
         with col3:
             pace = st.radio("⚡ Travel Pace*", ["relaxed", "moderate", "intensive"], horizontal=False)
         
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            adults = st.number_input("🧑 Adults*", min_value=1, max_value=GROUP_MAX_TRAVELERS, value=1)
+        
+        with col2:
+            children = st.number_input("🧒 Children", min_value=0, max_value=GROUP_MAX_TRAVELERS - 1, value=0)
+        
+        with col3:
+            rooms = st.number_input("🛏️ Rooms*", min_value=1, max_value=GROUP_MAX_TRAVELERS, value=1)
+        
         st.markdown("---")
         
         interests = st.multiselect(
             "🎯 Your Interests* (Select multiple)",
-            ["Culture & Art", "Food & Gastronomy", "Adventure & Outdoor", 
-             "History & Heritage", "Shopping", "Nature & Wildlife", "Relaxation"],
+            INTEREST_CATEGORIES,
             help="Select activities you enjoy"
         )
         
+        compare_scenarios = st.checkbox(
+            "🔀 Compare all travel styles & budgets",
+            help="Plan budget, mid-range and luxury at three budget levels from one data fetch"
+        )
+        
         st.markdown("---")
         submitted = st.form_submit_button("🚀 Generate My Travel Plan", type="primary", use_container_width=True)
     
-    if submitted:
-        return {
-            'submitted': True,
-            'destination': destination,
-            'origin': origin,
-            'start_date': start_date.strftime('%Y-%m-%d'),
-            'end_date': end_date.strftime('%Y-%m-%d'),
-            'budget': budget,
-            'interests': interests,
-            'travel_style': travel_style,
-            'pace': pace
-        }
-    
-    return {'submitted': False}
+    return {
+        'submitted': submitted,
+        'destination': destination.name if destination else st.session_state.get('destination', '').strip(),
+        'destination_id': destination.id if destination else None,
+        'origin': origin.name if origin else st.session_state.get('origin', '').strip(),
+        'origin_id': origin.id if origin else None,
+        'start_date': start_date.strftime('%Y-%m-%d'),
+        'end_date': end_date.strftime('%Y-%m-%d'),
+        'budget': budget,
+        'adults': adults,
+        'children': children,
+        'rooms': rooms,
+        'interests': interests,
+        'travel_style': travel_style,
+        'pace': pace,
+        'compare_scenarios': compare_scenarios
+    }
 
 def render_summary_cards(result):
     '''Render trip overview cards'''
@@ -57,10 +111,11 @@ def render_summary_cards(result):
     with col2:
         st.metric("📅 Duration", f"{result['summary']['duration']} days")
     with col3:
-        st.metric("💰 Total Budget", f"${result['summary']['total_budget']}")
+        st.metric("💰 Total Budget", format_money(result['summary']['total_budget']))
     with col4:
         st.metric("✈️ Travel Style", result['summary']['travel_style'].title())
     
+    st.caption(f"👥 {result['summary']['travelers']}")
     st.markdown("---")
 
 def render_insights(insights):
@@ -73,7 +128,8 @@ def render_insights(insights):
     with col2:
         st.success(f"**📊 Budget Usage**\n\n{insights['budget_utilization']} utilized")
     with col3:
-        st.warning(f"**📈 Daily Average**\n\n{insights['daily_average']} per day")
+        st.warning(f"**📈 Daily Average**\n\n{insights['daily_average']} per day\n\n"
+                   f"{format_money(insights['per_person_cost'])} per person".replace('$', '\\$'))
     
     col1, col2 = st.columns(2)
     with col1:
@@ -97,24 +153,22 @@ def render_flights(result):
         st.subheader("🌟 Selected Flight (Best Value)")
         if result['flight']:
             flight = result['flight']
-            segment = flight['itineraries'][0]['segments'][0]
             
             flight_col1, flight_col2, flight_col3 = st.columns(3)
             with flight_col1:
-                st.write(f"**Airline:** {flight.get('validatingAirlineCodes', ['N/A'])[0]}")
-                st.write(f"**Flight:** {segment.get('carrierCode', 'XX')}-{segment.get('number', '0000')}")
+                st.write(f"**Airline:** {flight['airline']}")
+                st.write(f"**Flight:** {flight['flight_number']}")
             with flight_col2:
-                st.write(f"**Departure:** {segment['departure']['at']}")
-                st.write(f"**Arrival:** {segment['arrival']['at']}")
+                st.write(f"**Departure:** {flight['departure']}")
+                st.write(f"**Arrival:** {flight['arrival']}")
             with flight_col3:
-                st.write(f"**Duration:** {flight['itineraries'][0]['duration']}")
-                st.write(f"**Price:** ${flight['price']['total']}")
+                st.write(f"**Duration:** {flight['duration']}")
+                st.write(f"**Price:** {format_money(flight['price'], flight['currency'])}")
     
     with col2:
         st.subheader("Alternative Options")
-        alt_flights = result['all_flights'][1:4]
-        for i, alt in enumerate(alt_flights, 1):
-            st.caption(f"Option {i+1}: ${alt['price']['total']}")
+        for i, alt in enumerate(result['alt_flights'], 1):
+            st.caption(f"Option {i+1}: {format_money(alt['price'], alt['currency'])}")
     
     st.markdown("---")
 
@@ -127,67 +181,88 @@ def render_hotels(result):
         st.subheader("🌟 Selected Hotel (Best Match)")
         if result['hotel']:
             hotel = result['hotel']
-            offer = hotel['offers'][0]
             
             hotel_col1, hotel_col2 = st.columns(2)
             with hotel_col1:
-                st.write(f"**Hotel:** {hotel['hotel']['name']}")
-                st.write(f"**Rating:** {'⭐' * hotel['hotel'].get('rating', 4)}")
-                st.write(f"**Room Type:** {offer['room']['description']['text']}")
+                st.write(f"**Hotel:** {hotel['name']}")
+                st.write(f"**Rating:** {'⭐' * hotel['rating']}")
+                st.write(f"**Room Type:** {hotel['room']}")
+                st.write(f"**Rooms:** {hotel['rooms']}")
             with hotel_col2:
-                st.write(f"**Price/Night:** ${offer['price']['base']}")
-                st.write(f"**Total Cost:** ${offer['price']['total']}")
-                st.write(f"**Amenities:** {', '.join(hotel.get('amenities', ['WiFi', 'Breakfast'])[:3])}")
+                st.write(f"**Price/Night per Room:** {format_money(hotel['price_per_night'], hotel['currency'])}")
+                st.write(f"**Total Cost:** {format_money(hotel['price'], hotel['currency'])}")
+                st.write(f"**Amenities:** {', '.join(hotel['amenities'])}")
     
     with col2:
         st.subheader("Alternative Hotels")
-        alt_hotels = result['all_hotels'][1:4]
-        for i, alt in enumerate(alt_hotels, 1):
-            st.caption(f"{alt['hotel']['name']}: ${alt['offers'][0]['price']['base']}/night")
+        for alt in result['alt_hotels']:
+            st.caption(f"{alt['name']}: {format_money(alt['price_per_night'], alt['currency'])}/night")
     
     st.markdown("---")
 
+def _render_slot(icon, title, slot):
+    return (
+        f"<div style='flex:1;min-width:200px'>"
+        f"<h4>{icon} {title}</h4>"
+        f"<b>⏰ {escape(slot['time'])}</b><br>"
+        f"<b>📍 {escape(str(slot['activity']))}</b><br>"
+        f"⭐ Rating: {slot['rating']}/5.0<br>"
+        f"💵 Cost: {format_money(slot['cost'])}<br>"
+        f"<small>{escape(str(slot['description']))}</small>"
+        f"</div>"
+    )
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _itinerary_day_blocks(plan_id, _itinerary):
+    '''Pre-render each day as one (expander label, HTML body) pair, cached per plan ID'''
+    blocks = []
+    for day_data in _itinerary.values():
+        label = (
+            f"**Day {day_data['day_number']}: {day_data['date']}** | "
+            f"☁️ {day_data['weather']['condition']} ({day_data['weather']['temperature']}"
+            f"{', typical' if day_data['weather'].get('source') == 'climatology' else ''}) | "
+            f"💵 {format_money(day_data['total_cost'])} | "
+            f"⚡ {day_data['energy_level']} Pace"
+        )
+        body = (
+            f"<p>🌤️ {escape(day_data['weather']['recommendation'])}</p>"
+            f"<div style='display:flex;gap:1rem;flex-wrap:wrap'>"
+            f"{_render_slot('🌅', 'Morning', day_data['morning'])}"
+            f"{_render_slot('☀️', 'Afternoon', day_data['afternoon'])}"
+            f"{_render_slot('🌙', 'Evening', day_data['evening'])}"
+            f"</div><hr>"
+            f"<p>💡 <b>Daily Tips:</b> {escape(day_data['tips'])}</p>"
+        )
+        blocks.append((label, body))
+    return blocks
+
 def render_itinerary(result):
-    '''Render day-by-day itinerary'''
+    '''Render day-by-day itinerary, one page of days at a time'''
     st.header("📅 Detailed Day-by-Day Itinerary")
     
-    for day_key, day_data in result['itinerary'].items():
-        with st.expander(
-            f"**Day {day_data['day_number']}: {day_data['date']}** | "
-            f"☁️ {day_data['weather']['condition']} ({day_data['weather']['temperature']}) | "
-            f"💵 ${day_data['total_cost']} | "
-            f"⚡ {day_data['energy_level']} Pace",
-            expanded=(day_data['day_number'] == 1)
-        ):
-            st.info(f"🌤️ {day_data['weather']['recommendation']}")
-            
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                st.markdown("### 🌅 Morning")
-                st.write(f"**⏰ {day_data['morning']['time']}**")
-                st.write(f"**📍 {day_data['morning']['activity']}**")
-                st.write(f"⭐ Rating: {day_data['morning']['rating']}/5.0")
-                st.write(f"💵 Cost: ${day_data['morning']['cost']}")
-                st.caption(day_data['morning']['description'])
-            
-            with col2:
-                st.markdown("### ☀️ Afternoon")
-                st.write(f"**⏰ {day_data['afternoon']['time']}**")
-                st.write(f"**📍 {day_data['afternoon']['activity']}**")
-                st.write(f"⭐ Rating: {day_data['afternoon']['rating']}/5.0")
-                st.write(f"💵 Cost: ${day_data['afternoon']['cost']}")
-                st.caption(day_data['afternoon']['description'])
-            
-            with col3:
-                st.markdown("### 🌙 Evening")
-                st.write(f"**⏰ {day_data['evening']['time']}**")
-                st.write(f"**📍 {day_data['evening']['activity']}**")
-                st.write(f"⭐ Rating: {day_data['evening']['rating']}/5.0")
-                st.write(f"💵 Cost: ${day_data['evening']['cost']}")
-                st.caption(day_data['evening']['description'])
-            
-            st.markdown("---")
-            st.success(f"💡 **Daily Tips:** {day_data['tips']}")
+    blocks = _itinerary_day_blocks(result['plan_id'], result['itinerary'])
+    pages = [blocks[i:i + ITINERARY_DAYS_PER_PAGE] for i in range(0, len(blocks), ITINERARY_DAYS_PER_PAGE)]
+    
+    page = 0
+    if len(pages) > 1:
+        labels = [f"Week {n + 1} (Days {n * ITINERARY_DAYS_PER_PAGE + 1}-{n * ITINERARY_DAYS_PER_PAGE + len(p)})"
+                  for n, p in enumerate(pages)]
+        page = labels.index(st.radio("Show", labels, horizontal=True,
+                                     key=f"itinerary_page_{result['plan_id']}", label_visibility="collapsed"))
+    
+    for i, (label, body) in enumerate(pages[page] if pages else []):
+        with st.expander(label, expanded=(page == 0 and i == 0)):
+            st.markdown(body, unsafe_allow_html=True)
+    
+    st.markdown("---")
+
+def render_provider_health(health):
+    '''Render external provider circuit status in the sidebar'''
+    state_icons = {'closed': '🟢', 'half-open': '🟡', 'open': '🔴'}
     
-    st.markdown("---")
\ No newline at end of file
+    with st.sidebar:
+        st.subheader("🩺 Provider Health")
+        for provider in health:
+            latency = f"{provider['p95_latency']:.2f}s" if provider['p95_latency'] is not None else 'n/a'
+            st.write(f"{state_icons[provider['state']]} **{provider['provider'].title()}** — {provider['state']}")
+            st.caption(f"{provider['calls']} recent calls | {provider['error_rate']:.0%} errors | p95 {latency}")
@@ -1,5 +1,28 @@
 import json
+import hashlib
 import streamlit as st
+from ledger import format_money
+from config import GROUP_MAX_TRAVELERS
+
+PLAN_REQUEST_FIELDS = ('destination', 'destination_id', 'origin', 'origin_id', 'start_date', 'end_date',
+                       'budget', 'adults', 'children', 'rooms', 'interests', 'travel_style', 'pace',
+                       'compare_scenarios')
+
+def normalize_request(form_data):
+    '''The fields that determine a plan, with free-text and ordering differences removed'''
+    normalized = {k: form_data.get(k) for k in PLAN_REQUEST_FIELDS}
+    normalized['destination'] = ' '.join((normalized['destination'] or '').lower().split())
+    normalized['origin'] = ' '.join((normalized['origin'] or '').lower().split())
+    normalized['interests'] = sorted(normalized['interests'] or [])
+    return normalized
+
+def request_fingerprint(form_data, extra=None):
+    '''Stable hash of the fields that determine a plan, plus any extra versioning data'''
+    normalized = normalize_request(form_data)
+    if extra:
+        normalized['_extra'] = extra
+    payload = json.dumps(normalized, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
 
 def validate_form_data(form_data):
     '''Validate form submission'''
@@ -7,6 +30,25 @@ def validate_form_data(form_data):
         st.error("⚠️ Please fill in destination and origin cities!")
         return False
     
+    destination = form_data.get('destination_id') or ' '.join(form_data['destination'].lower().split())
+    origin = form_data.get('origin_id') or ' '.join(form_data['origin'].lower().split())
+    if destination == origin:
+        st.error("⚠️ Destination and origin must be different cities!")
+        return False
+    
+    # Cities outside the bundled index are still planned, resolved through the Amadeus lookup
+    unresolved = [form_data[f] for f in ('destination', 'origin') if not form_data.get(f'{f}_id')]
+    if unresolved:
+        st.warning(f"⚠️ {' and '.join(unresolved)} not in the city index - looking up online, results may be less precise")
+    
+    if form_data['adults'] + form_data['children'] > GROUP_MAX_TRAVELERS:
+        st.error(f"⚠️ Groups are limited to {GROUP_MAX_TRAVELERS} travelers per booking!")
+        return False
+    
+    if form_data['rooms'] > form_data['adults']:
+        st.error("⚠️ Every room needs at least one adult!")
+        return False
+    
     if not form_data['interests']:
         st.error("⚠️ Please select at least one interest!")
         return False
@@ -24,31 +66,49 @@ def validate_form_data(form_data):
 def generate_export_data(result, destination, start_date):
     '''Generate export files'''
     
-    # JSON Export
+    # JSON Export (raw provider payloads are referenced via raw_refs, not embedded)
     json_data = json.dumps(result, indent=2, default=str)
     
     # Text Summary
+    day_lines = [
+        f"Day {d['day_number']}: {d['date']}\n"
+        f"  Morning: {d['morning']['activity']}\n"
+        f"  Afternoon: {d['afternoon']['activity']}\n"
+        f"  Evening: {d['evening']['activity']}\n"
+        for d in result['itinerary'].values()
+    ]
+    
+    ledger = result['ledger']
+    currency = ledger['currency']
+    costs = ledger['totals']['by_category']
+    cost_lines = [f"- {k.title()}: {format_money(v, currency)}" for k, v in costs.items()]
+    
     text_summary = f"""
 SMART AI TRAVEL PLANNER
 ========================
 
 Destination: {result['summary']['destination']}
 Duration: {result['summary']['duration']} days
-Budget: ${result['summary']['total_budget']}
+Travelers: {result['summary']['travelers']}
+Budget: {format_money(result['summary']['total_budget'], currency)}
 Dates: {result['summary']['dates']}
 
 BUDGET BREAKDOWN:
-{chr(10).join([f"- {k.title()}: ${v}" for k, v in result['budget_breakdown'].items()])}
+{chr(10).join([f"- {k.title()}: {format_money(v, currency)}" for k, v in result['budget_breakdown'].items()])}
+
+PLANNED COSTS ({currency}):
+{chr(10).join(cost_lines)}
+- Total: {format_money(ledger['totals']['total'], currency)}
 
 SELECTED FLIGHT:
-Price: ${result['flight']['price']['total'] if result['flight'] else 'N/A'}
+Price: {format_money(costs['flights'], currency) if result['flight'] else 'N/A'}
 
 SELECTED HOTEL:
-{result['hotel']['hotel']['name'] if result['hotel'] else 'N/A'}
-Price: ${result['hotel']['offers'][0]['price']['total'] if result['hotel'] else 'N/A'}
+{result['hotel']['name'] if result['hotel'] else 'N/A'}
+Price: {format_money(costs['hotels'], currency) if result['hotel'] else 'N/A'}
 
 DAY-BY-DAY ITINERARY:
-{chr(10).join([f"Day {d['day_number']}: {d['date']}\n  Morning: {d['morning']['activity']}\n  Afternoon: {d['afternoon']['activity']}\n  Evening: {d['evening']['activity']}\n" for d in result['itinerary'].values()])}
+{chr(10).join(day_lines)}
 """
     
     return json_data, text_summary
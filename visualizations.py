@@ -1,6 +1,92 @@
 import streamlit as st
 import plotly.express as px
 import pandas as pd
+from ledger import format_money
+from config import CHART_MODE, CHART_NATIVE_MIN_DAYS
+
+def _figure_spec(fig):
+    '''Bare figure dict for st.plotly_chart with an empty template, since the Streamlit
+    theme restyles the chart in the browser anyway. The template must be set to empty
+    rather than removed: st.plotly_chart rebuilds a Figure, which refills a missing one.'''
+    spec = fig.to_plotly_json()
+    spec['layout']['template'] = {}
+    spec['layout']['margin'] = {'l': 10, 'r': 10, 't': 40, 'b': 10}
+    return spec
+
+def _use_native_charts(days):
+    '''Long trips get Streamlit's native charts instead of one Plotly point per day'''
+    if CHART_MODE in ('plotly', 'native'):
+        return CHART_MODE == 'native'
+    return days >= CHART_NATIVE_MIN_DAYS
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _budget_figure(plan_id, _budget_data):
+    '''Budget allocation pie, built once per plan ID'''
+    fig = px.pie(
+        values=list(_budget_data.values()),
+        names=[k.title() for k in _budget_data.keys()],
+        title="Budget Allocation Strategy",
+        hole=0.4,
+        color_discrete_sequence=px.colors.qualitative.Set3
+    )
+    return _figure_spec(fig)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _weather_frame(plan_id, _weather):
+    '''Forecast table with display column names, built once per plan ID'''
+    return pd.DataFrame(_weather).rename(columns={
+        'date': 'Date',
+        'temp': 'Temperature (°C)',
+        'condition': 'Condition',
+        'humidity': 'Humidity (%)',
+        'source': 'Source'
+    })
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _weather_figures(plan_id, _weather):
+    '''Temperature and humidity figures, built once per plan ID'''
+    weather_df = _weather_frame(plan_id, _weather)
+    
+    temperature = px.line(
+        weather_df, 
+        x='Date', 
+        y='Temperature (°C)', 
+        color='Source',
+        title='Temperature Trend',
+        markers=True,
+        line_shape='spline'
+    )
+    temperature.update_layout(hovermode='x unified')
+    
+    humidity = px.bar(
+        weather_df,
+        x='Date',
+        y='Humidity (%)',
+        title='Humidity Levels',
+        color='Humidity (%)',
+        color_continuous_scale='Blues'
+    )
+    return _figure_spec(temperature), _figure_spec(humidity)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _scenario_figure(plan_id, _table):
+    '''Planned cost by scenario bar chart, built once per plan ID'''
+    chart_df = pd.DataFrame(_table).melt(
+        id_vars=['Style', 'Budget'],
+        value_vars=['Flights', 'Hotels', 'Activities & Food'],
+        var_name='Category',
+        value_name='Cost'
+    )
+    chart_df['Scenario'] = chart_df['Style'].str.title() + ' / ' + chart_df['Budget'].map(format_money)
+    fig = px.bar(
+        chart_df,
+        x='Scenario',
+        y='Cost',
+        color='Category',
+        title='Planned Cost by Scenario',
+        color_discrete_sequence=px.colors.qualitative.Set3
+    )
+    return _figure_spec(fig)
 
 def render_budget_visualizations(result):
     '''Render budget allocation charts'''
@@ -10,66 +96,72 @@ def render_budget_visualizations(result):
     
     with col1:
         st.subheader("Planned Budget Distribution")
-        budget_data = result['budget_breakdown']
-        fig = px.pie(
-            values=list(budget_data.values()),
-            names=[k.title() for k in budget_data.keys()],
-            title="Budget Allocation Strategy",
-            hole=0.4,
-            color_discrete_sequence=px.colors.qualitative.Set3
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(_budget_figure(result['plan_id'], result['budget_breakdown']), use_container_width=True)
+        
+        split = result['budget_split']
+        if result['party']['adults'] + result['party']['children'] > 1:
+            per_person = ', '.join(f"{k.title()} {format_money(v)}" for k, v in split['per_person'].items())
+            shared = ', '.join(f"{k.title()} {format_money(v)}" for k, v in split['shared'].items())
+            # Escaped so two dollar amounts are not rendered as a LaTeX span
+            st.caption(f"Per person: {per_person}. Shared by the group: {shared}.".replace('$', '\\$'))
     
     with col2:
         st.subheader("Actual Costs")
-        actual_costs = result['actual_costs']
+        ledger = result['ledger']
+        currency = ledger['currency']
+        costs = ledger['totals']['by_category']
+        total = ledger['totals']['total']
         
-        st.metric("✈️ Flights", f"${actual_costs['flights']:.2f}")
-        st.metric("🏨 Hotels", f"${actual_costs['hotels']:.2f}")
-        st.metric("🎯 Activities & Food", f"${actual_costs['activities_food']:.2f}")
-        st.metric("💵 Total Spent", f"${actual_costs['total_used']:.2f}", 
-                 delta=f"${result['summary']['total_budget'] - actual_costs['total_used']:.2f} remaining")
+        st.metric("✈️ Flights", format_money(costs.get('flights', 0), currency))
+        st.metric("🏨 Hotels", format_money(costs.get('hotels', 0), currency))
+        st.metric("🎯 Activities & Food", format_money(costs.get('activities', 0) + costs.get('food', 0), currency))
+        st.metric("💵 Total Spent", format_money(total, currency), 
+                 delta=f"{format_money(result['summary']['total_budget'] - total, currency)} remaining")
     
     st.markdown("---")
 
 def render_weather_charts(result, insights):
     '''Render weather forecast charts'''
     st.header("🌤️ Weather Forecast")
-    
-    weather_data = result['weather_summary']['list']
-    weather_df = pd.DataFrame([{
-        'Date': w['dt_txt'],
-        'Temperature (°C)': w['main']['temp'],
-        'Condition': w['weather'][0]['main'],
-        'Humidity (%)': w['main']['humidity']
-    } for w in weather_data])
+    st.caption("Days beyond the forecast horizon show typical monthly climate for the destination.")
     
     col1, col2 = st.columns(2)
     
-    with col1:
-        fig = px.line(
-            weather_df, 
-            x='Date', 
-            y='Temperature (°C)', 
-            title='Temperature Trend',
-            markers=True,
-            line_shape='spline'
-        )
-        fig.update_layout(hovermode='x unified')
-        st.plotly_chart(fig, use_container_width=True)
-    
-    with col2:
-        fig = px.bar(
-            weather_df,
-            x='Date',
-            y='Humidity (%)',
-            title='Humidity Levels',
-            color='Humidity (%)',
-            color_continuous_scale='Blues'
-        )
-        st.plotly_chart(fig, use_container_width=True)
+    if _use_native_charts(len(result['weather'])):
+        weather_df = _weather_frame(result['plan_id'], result['weather'])
+        with col1:
+            st.markdown("**Temperature Trend**")
+            st.line_chart(weather_df, x='Date', y='Temperature (°C)', color='Source')
+        with col2:
+            st.markdown("**Humidity Levels**")
+            st.bar_chart(weather_df, x='Date', y='Humidity (%)')
+    else:
+        temperature, humidity = _weather_figures(result['plan_id'], result['weather'])
+        with col1:
+            st.plotly_chart(temperature, use_container_width=True)
+        with col2:
+            st.plotly_chart(humidity, use_container_width=True)
     
     if insights['weather_alerts'] and insights['weather_alerts'][0] != 'No rain expected':
         st.warning(f"⚠️ **Weather Alerts:** Rain expected on {', '.join(insights['weather_alerts'][:2])}")
     
-    st.markdown("---")
\ No newline at end of file
+    st.markdown("---")
+
+def render_scenario_comparison(scenarios, plan_id):
+    '''Render travel style x budget comparison table and chart'''
+    st.header("🔀 Scenario Comparison")
+    
+    scenario_df = pd.DataFrame(scenarios['table'])
+    
+    st.dataframe(
+        scenario_df.style.format({
+            column: format_money
+            for column in ('Budget', 'Flights', 'Hotels', 'Activities & Food', 'Total', 'Remaining')
+        }),
+        use_container_width=True,
+        hide_index=True
+    )
+    
+    st.plotly_chart(_scenario_figure(plan_id, scenarios['table']), use_container_width=True)
+    
+    st.markdown("---")